@@ -16,6 +16,7 @@ from models.document import Document, DocumentText
 from models.profile import Profile
 from models.opportunity import Opportunity, OpportunityRequirement, OpportunityStatus, OpportunityType
 from models.material import GeneratedMaterial, MaterialType
+from models.job_posting import JobPosting, JobSearchSlice
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,72 @@
+"""add job postings index
+
+Revision ID: 5c1e9a7b3d20
+Revises: d94df8bde6a0
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e9a7b3d20'
+down_revision: Union[str, Sequence[str], None] = 'd94df8bde6a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'job_postings',
+        sa.Column('id', sa.String(length=64), nullable=False),
+        sa.Column('country', sa.String(length=8), nullable=False),
+        sa.Column('title', sa.String(length=512), nullable=False),
+        sa.Column('company', sa.String(length=255), nullable=True),
+        sa.Column('location', sa.String(length=255), nullable=True),
+        sa.Column('category', sa.String(length=255), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('redirect_url', sa.Text(), nullable=True),
+        sa.Column('salary_min', sa.Integer(), nullable=True),
+        sa.Column('salary_max', sa.Integer(), nullable=True),
+        sa.Column('created', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('raw', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('fetched_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(company, '') || ' ' || coalesce(category, '')), 'B') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_job_postings_search_vector', 'job_postings', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_job_postings_country_expires_at', 'job_postings', ['country', 'expires_at'], unique=False)
+
+    op.create_table(
+        'job_search_slices',
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('country', sa.String(length=8), nullable=False),
+        sa.Column('job_ids', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('total_records', sa.Integer(), nullable=False),
+        sa.Column('fetched_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('job_search_slices')
+    op.drop_index('ix_job_postings_country_expires_at', table_name='job_postings')
+    op.drop_index('ix_job_postings_search_vector', table_name='job_postings', postgresql_using='gin')
+    op.drop_table('job_postings')
@@ -0,0 +1,89 @@
+"""add requirement text hash
+
+Re-analysing an opportunity upserts its requirements keyed on
+(opportunity_id, text_hash) instead of appending duplicates. Existing rows
+are hashed, duplicates left behind by earlier re-analyses are removed
+(newest kept), and the unique key replaces the opportunity_id index.
+
+Revision ID: c3d8f1a5b7e2
+Revises: b61d0e4f8c25
+Create Date: 2026-10-19 19:12:40.318524
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d8f1a5b7e2'
+down_revision: Union[str, Sequence[str], None] = 'b61d0e4f8c25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BATCH_SIZE = 1000
+
+
+def _text_hash(requirement_text: str) -> str:
+    # Frozen copy of models.opportunity.requirement_text_hash
+    normalized = " ".join(requirement_text.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('opportunity_requirements', sa.Column('text_hash', sa.String(length=64), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, requirement_text FROM opportunity_requirements")).all()
+    update = sa.text("UPDATE opportunity_requirements SET text_hash = :text_hash WHERE id = :id")
+    for start in range(0, len(rows), BATCH_SIZE):
+        conn.execute(update, [
+            {"id": row_id, "text_hash": _text_hash(requirement_text)}
+            for row_id, requirement_text in rows[start:start + BATCH_SIZE]
+        ])
+
+    op.execute(
+        "DELETE FROM opportunity_requirements a USING opportunity_requirements b "
+        "WHERE a.opportunity_id = b.opportunity_id AND a.text_hash = b.text_hash AND a.id < b.id"
+    )
+    op.alter_column('opportunity_requirements', 'text_hash', nullable=False)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_opportunity_requirements_opportunity_id_text_hash',
+            'opportunity_requirements',
+            ['opportunity_id', 'text_hash'],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'idx_opportunity_requirements_opportunity_id',
+            table_name='opportunity_requirements',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_opportunity_requirements_opportunity_id',
+            'opportunity_requirements',
+            ['opportunity_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'uq_opportunity_requirements_opportunity_id_text_hash',
+            table_name='opportunity_requirements',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column('opportunity_requirements', 'text_hash')
@@ -0,0 +1,53 @@
+"""make timeline timestamps not null
+
+The list endpoints page by (timestamp, id) and put the timestamp in the
+cursor, so a NULL there breaks pagination. Existing NULLs are backfilled
+(from updated_at where the table has one, else the migration time), then
+the columns are made NOT NULL. Each step commits on its own, and a CHECK
+constraint is validated first so SET NOT NULL does not hold an exclusive
+lock for a full table scan.
+
+Revision ID: f2a9c4e7b1d3
+Revises: c3d8f1a5b7e2
+Create Date: 2026-10-19 21:34:17.502961
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a9c4e7b1d3'
+down_revision: Union[str, Sequence[str], None] = 'c3d8f1a5b7e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, timestamp column, backfill expression)
+COLUMNS = [
+    ('profiles', 'created_at', 'COALESCE(updated_at, now())'),
+    ('opportunities', 'created_at', 'COALESCE(updated_at, now())'),
+    ('documents', 'uploaded_at', 'now()'),
+    ('generated_materials', 'created_at', 'now()'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, column, backfill in COLUMNS:
+            constraint = f'ck_{table}_{column}_not_null'
+            op.execute(f'UPDATE {table} SET {column} = {backfill} WHERE {column} IS NULL')
+            op.execute(f'ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {constraint}')
+            op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {constraint} CHECK ({column} IS NOT NULL) NOT VALID')
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {constraint}')
+            op.alter_column(table, column, existing_type=sa.DateTime(timezone=True), nullable=False)
+            op.drop_constraint(constraint, table, type_='check')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column, _ in reversed(COLUMNS):
+        op.alter_column(table, column, existing_type=sa.DateTime(timezone=True), nullable=True)
@@ -0,0 +1,145 @@
+"""
+Benchmark: throughput and text quality of every registered extraction engine.
+
+Builds a fixture corpus of synthetic PDFs and DOCX files with known text
+(or uses --corpus DIR, where `name.txt` next to `name.pdf` / `name.docx`
+is taken as the expected text). Every file is run through every engine
+that handles its type, in-process, and reported with:
+
+- median wall time and throughput (pages/s for PDFs, MB/s for all files)
+- text_quality: share of word-like tokens, the same score auto-selection uses
+- recall / precision of output tokens against the expected text
+
+The per-engine summary at the end is what PDF_ENGINE_PREFERENCE and
+DOCX_ENGINE_PREFERENCE in utils/extraction_engines.py are based on.
+
+Run from backend/ with the usual environment loaded:
+
+    python -m benchmarks.extraction_engines --repeat 5
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import docx
+
+from benchmarks.pdf_extraction import LOREM, make_pdf
+from utils.extraction_engines import engines_for, text_quality
+from utils.file_utils import count_pdf_pages
+
+PDF_PAGE_COUNTS = [1, 5, 20, 80]
+DOCX_PARAGRAPH_COUNTS = [20, 200, 2000]
+
+
+def make_docx(path: str, paragraphs: int, table_rows: int = 10) -> str:
+    """Write a DOCX with body paragraphs and a layout table; returns the expected text."""
+    document = docx.Document()
+    written = []
+    for number in range(paragraphs):
+        text = f"Paragraph {number + 1} {LOREM}"
+        document.add_paragraph(text)
+        written.append(text)
+    table = document.add_table(rows=table_rows, cols=2)
+    for row_number, row in enumerate(table.rows):
+        for col_number, cell in enumerate(row.cells):
+            cell.text = f"Cell {row_number + 1}.{col_number + 1} skill"
+            written.append(cell.text)
+    document.save(path)
+    return "\n".join(written)
+
+
+def _token_scores(output: str, expected: str) -> Tuple[float, float]:
+    """Bag-of-tokens recall and precision of `output` against `expected`."""
+    got, want = Counter(output.split()), Counter(expected.split())
+    overlap = sum((got & want).values())
+    recall = overlap / max(sum(want.values()), 1)
+    precision = overlap / max(sum(got.values()), 1)
+    return recall, precision
+
+
+def build_corpus(directory: str) -> List[Tuple[str, Optional[str]]]:
+    corpus = []
+    for pages in PDF_PAGE_COUNTS:
+        path = os.path.join(directory, f"synthetic_{pages:03d}p.pdf")
+        corpus.append((path, make_pdf(path, pages)))
+    for paragraphs in DOCX_PARAGRAPH_COUNTS:
+        path = os.path.join(directory, f"synthetic_{paragraphs:04d}.docx")
+        corpus.append((path, make_docx(path, paragraphs)))
+    return corpus
+
+
+def load_corpus(directory: str) -> List[Tuple[str, Optional[str]]]:
+    corpus = []
+    for path in sorted(Path(directory).iterdir()):
+        if path.suffix.lower() not in (".pdf", ".docx", ".doc"):
+            continue
+        expected = path.with_suffix(".txt")
+        corpus.append((str(path), expected.read_text() if expected.exists() else None))
+    return corpus
+
+
+def run(corpus: List[Tuple[str, Optional[str]]], repeat: int) -> None:
+    summary: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+
+    print(f"{'file':<26} {'engine':<12} {'ms':>9} {'pages/s':>8} {'MB/s':>7} "
+          f"{'quality':>8} {'recall':>7} {'precision':>9}")
+    for path, expected in corpus:
+        file_ext = Path(path).suffix.lower()
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        pages = count_pdf_pages(path) if file_ext == ".pdf" else None
+
+        for engine in engines_for(file_ext):
+            timings = []
+            text = ""
+            try:
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    text = engine.extract(path)
+                    timings.append(time.perf_counter() - started)
+            except Exception as e:
+                print(f"{Path(path).name:<26} {engine.name:<12} failed: {e}")
+                continue
+
+            seconds = statistics.median(timings)
+            quality = text_quality(text)
+            stats = summary[engine.name]
+            stats["seconds"].append(seconds)
+            stats["mb"].append(size_mb)
+            stats["quality"].append(quality)
+
+            pages_per_s = f"{pages / seconds:8.0f}" if pages else f"{'-':>8}"
+            recall = precision = "-"
+            if expected is not None:
+                r, p = _token_scores(text, expected)
+                stats["recall"].append(r)
+                stats["precision"].append(p)
+                recall, precision = f"{r:.3f}", f"{p:.3f}"
+            print(f"{Path(path).name:<26} {engine.name:<12} {seconds * 1000:9.1f} {pages_per_s} "
+                  f"{size_mb / seconds:7.2f} {quality:8.3f} {recall:>7} {precision:>9}")
+
+    print(f"\n{'engine':<12} {'files':>5} {'total s':>8} {'MB/s':>7} {'quality':>8} {'recall':>7}")
+    for name, stats in summary.items():
+        total = sum(stats["seconds"])
+        recall = f"{statistics.mean(stats['recall']):.3f}" if stats["recall"] else "-"
+        print(f"{name:<12} {len(stats['seconds']):>5} {total:8.3f} {sum(stats['mb']) / total:7.2f} "
+              f"{statistics.mean(stats['quality']):8.3f} {recall:>7}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", help="Directory of PDF/DOCX files (with optional .txt expected text)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = load_corpus(args.corpus) if args.corpus else build_corpus(tmp)
+        run(corpus, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
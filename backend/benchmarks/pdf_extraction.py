@@ -0,0 +1,150 @@
+"""
+Benchmark: serial vs page-parallel PDF text extraction.
+
+Generates a synthetic corpus of text PDFs (or uses --corpus DIR), then runs
+every file through the extraction pool twice: once as a single job and once
+split into page ranges. Prints one row per file and the smallest page count
+from which splitting wins on every larger file, which is the value to use
+for PDF_PARALLEL_MIN_PAGES.
+
+Run from backend/ with the usual environment loaded:
+
+    python -m benchmarks.pdf_extraction --workers 4 --repeat 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from utils.extraction_pool import ExtractionPool
+from utils.file_utils import count_pdf_pages
+
+DEFAULT_PAGE_COUNTS = [1, 2, 5, 10, 20, 30, 40, 60, 80, 120, 160, 200]
+
+LOREM = (
+    "Lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua"
+)
+
+
+def make_pdf(path: str, pages: int, lines_per_page: int = 50) -> str:
+    """
+    Write a minimal text-only PDF with `pages` pages of Helvetica text.
+
+    Returns the text that was written, one line per text line.
+    """
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # page tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_refs = []
+    written = []
+    for page in range(pages):
+        lines = [f"{page + 1}.{line + 1} {LOREM}" for line in range(lines_per_page)]
+        written.extend(lines)
+        operators = " ".join(f"({line}) Tj T*" for line in lines)
+        stream = ("BT /F1 9 Tf 11 TL 36 800 Td " + operators + " ET").encode()
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        page_refs.append(len(objects))
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref_offset,
+    )
+    Path(path).write_bytes(bytes(out))
+    return "\n".join(written)
+
+
+async def _time(pool: ExtractionPool, path: str, repeat: int) -> Tuple[float, str]:
+    timings = []
+    text = ""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        text, _ = await pool.extract(path)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), text
+
+
+async def run(files: List[str], workers: int, repeat: int, chunk: int) -> Optional[int]:
+    serial = ExtractionPool(max_workers=workers, pdf_parallel_min_pages=0)
+    parallel = ExtractionPool(
+        max_workers=workers, pdf_parallel_min_pages=1, pdf_min_pages_per_chunk=chunk,
+    )
+    try:
+        # Warm up: spawn every worker process before timing anything
+        for pool in (serial, parallel):
+            await asyncio.gather(*(pool.extract(files[0]) for _ in range(workers)))
+
+        rows = []
+        print(f"{'pages':>6} {'serial ms':>10} {'parallel ms':>12} {'speedup':>8}")
+        for path in files:
+            pages = count_pdf_pages(path)
+            serial_s, serial_text = await _time(serial, path, repeat)
+            parallel_s, parallel_text = await _time(parallel, path, repeat)
+            assert serial_text == parallel_text, f"output mismatch for {path}"
+            rows.append((pages, serial_s, parallel_s))
+            print(
+                f"{pages:>6} {serial_s * 1000:>10.1f} {parallel_s * 1000:>12.1f} "
+                f"{serial_s / parallel_s:>7.2f}x"
+            )
+    finally:
+        serial.shutdown()
+        parallel.shutdown()
+
+    crossover = None
+    for pages, serial_s, parallel_s in sorted(rows, reverse=True):
+        if parallel_s >= serial_s:
+            break
+        crossover = pages
+    return crossover
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", help="Directory of PDFs to use instead of the synthetic corpus")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--chunk", type=int, default=10, help="PDF_MIN_PAGES_PER_CHUNK")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.corpus:
+            files = sorted(str(p) for p in Path(args.corpus).glob("*.pdf"))
+        else:
+            files = []
+            for pages in DEFAULT_PAGE_COUNTS:
+                path = os.path.join(tmp, f"synthetic_{pages:03d}.pdf")
+                make_pdf(path, pages)
+                files.append(path)
+        files.sort(key=count_pdf_pages)
+
+        crossover = asyncio.run(run(files, args.workers, args.repeat, args.chunk))
+
+    if crossover is None:
+        print("\nPage-parallel extraction never won on this corpus")
+    else:
+        print(f"\nPage-parallel extraction wins from {crossover} pages up "
+              f"(PDF_PARALLEL_MIN_PAGES={crossover})")
+
+
+if __name__ == "__main__":
+    main()
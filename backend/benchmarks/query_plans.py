@@ -0,0 +1,121 @@
+"""
+Regression check: hot per-user queries must be served by their index.
+
+Runs EXPLAIN on the "latest profile" lookup and the per-user list queries
+(first page and a cursor-continued page, as built by utils.pagination) and
+fails (exit code 1) if a plan does not scan the expected index or
+still needs a Sort, i.e. if a schema or query change silently loses the
+ordered index path. Sequential scans and explicit sorts are disabled for
+the check so the result does not depend on how much data the database
+holds; on a near-empty dev database the planner would rightly pick a
+sequential scan anyway.
+
+Run from backend/ against a migrated database:
+
+    python -m benchmarks.query_plans
+"""
+import json
+import sys
+from datetime import datetime, timezone
+from typing import Iterator, List, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.sql import Select
+
+from config import get_settings
+from database import engine
+from models.document import Document
+from models.material import GeneratedMaterial
+from models.opportunity import Opportunity, OpportunityStatus
+from models.profile import Profile
+from models.user import User  # noqa: F401  (configures relationships)
+from utils.pagination import page_query
+
+settings = get_settings()
+
+USER_ID = 1
+OPPORTUNITY_ID = 1
+
+
+def hot_queries() -> List[Tuple[str, Select, str]]:
+    """(label, statement, index it must use), mirroring the routers."""
+    # A later page: continue after an arbitrary (timestamp, id) position
+    after = (datetime.now(timezone.utc), 2 ** 31 - 1)
+    limit = settings.DEFAULT_PAGE_SIZE + 1
+    queries = [
+        (
+            "latest profile",
+            select(Profile).where(Profile.user_id == USER_ID).order_by(Profile.created_at.desc()).limit(1),
+            "ix_profiles_user_id_created_at",
+        ),
+    ]
+    lists = [
+        (
+            "list profiles",
+            select(Profile).where(Profile.user_id == USER_ID),
+            Profile.created_at, Profile.id,
+            "ix_profiles_user_id_created_at",
+        ),
+        (
+            "list opportunities",
+            select(Opportunity).where(Opportunity.user_id == USER_ID),
+            Opportunity.created_at, Opportunity.id,
+            "ix_opportunities_user_id_created_at",
+        ),
+        (
+            "list opportunities by status",
+            select(Opportunity).where(
+                Opportunity.user_id == USER_ID, Opportunity.status == OpportunityStatus.APPLIED
+            ),
+            Opportunity.created_at, Opportunity.id,
+            "ix_opportunities_user_id_status_active",
+        ),
+        (
+            "list documents",
+            select(Document).where(Document.user_id == USER_ID),
+            Document.uploaded_at, Document.id,
+            "ix_documents_user_id_uploaded_at",
+        ),
+        (
+            "materials for opportunity",
+            select(GeneratedMaterial).where(GeneratedMaterial.opportunity_id == OPPORTUNITY_ID),
+            GeneratedMaterial.created_at, GeneratedMaterial.id,
+            "ix_generated_materials_opportunity_id_created_at",
+        ),
+    ]
+    for label, query, sort_column, id_column, index_name in lists:
+        queries.append((label, page_query(query, sort_column, id_column, None, limit), index_name))
+        queries.append((f"{label} (next page)", page_query(query, sort_column, id_column, after, limit), index_name))
+    return queries
+
+
+def _nodes(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def main() -> int:
+    failures = 0
+    with engine.connect() as conn:
+        conn.execute(text("SET enable_seqscan = off"))
+        conn.execute(text("SET enable_sort = off"))
+        for label, statement, index_name in hot_queries():
+            sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+            raw = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            nodes = list(_nodes(plan))
+            used = {node.get("Index Name") for node in nodes if node.get("Index Name")}
+            sorted_in_memory = any(node["Node Type"] in ("Sort", "Incremental Sort") for node in nodes)
+
+            ok = index_name in used and not sorted_in_memory
+            failures += not ok
+            detail = f"uses {', '.join(sorted(used)) or 'no index'}"
+            if sorted_in_memory:
+                detail += " + Sort"
+            print(f"{'ok  ' if ok else 'FAIL'} {label:<42} {detail}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
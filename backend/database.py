@@ -1,28 +1,70 @@
 """
 Database connection and session management.
+
+Route handlers use the asyncpg engine through `get_async_db`, so queries
+never block the event loop. The sync engine remains for table creation
+and background jobs that run in a worker thread.
 """
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from config import get_settings
 
 settings = get_settings()
 
-# Create database engine
+# Create database engine (startup and background jobs only)
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-    echo=settings.DEBUG
+    pool_size=2,
+    max_overflow=2,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    echo=settings.SQL_ECHO
 )
 
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+
+def _async_database_url() -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+
+# Async engine for request handlers
+async_engine = create_async_engine(
+    _async_database_url(),
+    pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    echo=settings.SQL_ECHO
+)
+
+# Objects stay loaded after commit, so handlers can serialize what they
+# just wrote without a refresh; touching an expired attribute would also
+# need implicit IO, which AsyncSession cannot do
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+class _ModelDefaults:
+    # Server-generated columns (ids, created_at, updated_at, ...) come back
+    # from the INSERT/UPDATE itself via RETURNING instead of a refresh query,
+    # and multi-row inserts are batched into INSERT ... VALUES ... RETURNING
+    __mapper_args__ = {"eager_defaults": True}
+
 
 # Base class for models
-Base = declarative_base()
+Base = declarative_base(cls=_ModelDefaults)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -37,6 +79,15 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get an async database session.
+    Yields a session and ensures it's closed after use.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
     """Initialize database tables."""
     Base.metadata.create_all(bind=engine)
@@ -8,9 +8,14 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from config import get_settings
-from database import init_db
+from database import init_db, AsyncSessionLocal, async_engine, engine
 from logging_config import setup_logging
-from routers import auth, documents, profiles, opportunities, materials, llm_health_check, grants, jobs
+from routers import auth, documents, profiles, opportunities, materials, llm_health_check, grants, jobs, search
+from services.jobs_client import jobs_client
+from services.job_index import job_index
+from services.storage_gc import storage_gc
+from utils import query_counter
+from utils.extraction_pool import extraction_pool
 from starlette.middleware.sessions import SessionMiddleware
 
 # Setup logging
@@ -57,6 +62,48 @@ async def log_requests(request: Request, call_next):
     
     return response
 
+query_counter.install(engine)
+query_counter.install(async_engine.sync_engine)
+
+@app.middleware("http")
+async def sql_instrumentation(request: Request, call_next):
+    """
+    Report per-request SQL count and time; in DEBUG, flag likely N+1 loads.
+
+    A streamed body (StreamingResponse, no Content-Length) runs after
+    call_next returns, so its queries are not counted; such responses get
+    no stats rather than a partial figure.
+    """
+    with query_counter.count_queries() as counter:
+        response = await call_next(request)
+    streamed = "content-length" not in response.headers
+
+    if counter.count and not streamed:
+        statement, duration = counter.slowest
+        logger.debug(
+            f"DB: {counter.count} queries, {counter.total_time * 1000:.1f}ms; "
+            f"slowest {duration * 1000:.1f}ms: {' '.join(statement.split())[:200]}"
+        )
+
+    if settings.DEBUG and 0 < settings.QUERY_COUNT_THRESHOLD < counter.count:
+        statement, repeats = counter.most_repeated()
+        message = (
+            f"{request.method} {request.url.path} issued {counter.count} queries "
+            f"(threshold {settings.QUERY_COUNT_THRESHOLD}); most repeated x{repeats}: {statement[:200]}"
+        )
+        if settings.QUERY_COUNT_STRICT:
+            raise query_counter.TooManyQueries(message)
+        logger.warning(message)
+
+    if settings.SQL_STATS_HEADERS and not streamed:
+        db_ms = counter.total_time * 1000
+        response.headers["X-DB-Query-Count"] = str(counter.count)
+        response.headers["X-DB-Time-Ms"] = f"{db_ms:.1f}"
+        # Server-Timing is a list header: add ours alongside any the handler set
+        response.headers.append("Server-Timing", f'db;dur={db_ms:.1f};desc="{counter.count} queries"')
+
+    return response
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Handles and logs any unhandled exception."""
@@ -76,6 +123,7 @@ app.include_router(materials.router)
 app.include_router(llm_health_check.router)
 app.include_router(grants.router)
 app.include_router(jobs.router)
+app.include_router(search.router)
 
 
 # --- Lifespan Events ---
@@ -84,10 +132,23 @@ async def startup_event():
     """Initialize database on startup."""
     init_db()
     logger.info("Database initialized")
+
+    async with AsyncSessionLocal() as db:
+        await job_index.purge_expired(db)
+    storage_gc.start()
     logger.info(f"Server starting on http://localhost:8000")
     logger.info(f"API docs available at http://localhost:8000/docs")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background work, close pooled upstream HTTP clients, the extraction process pool and DB connections."""
+    await storage_gc.stop()
+    await jobs_client.aclose()
+    extraction_pool.shutdown()
+    await async_engine.dispose()
+
+
 # --- Root and Health Check ---
 @app.get("/")
 async def root():
@@ -2,7 +2,8 @@
 Document models for file uploads and text extraction.
 """
 import enum
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Text, Index, desc
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -26,6 +27,7 @@ class Document(Base):
     filename = Column(String(255), nullable=False)
     file_path = Column(String(512), nullable=False)
     file_size = Column(Integer)
+    content_hash = Column(String(64), index=True)  # SHA-256 of the file contents
     # doc_type = Column(
     #             Enum(
     #                 DocumentType,
@@ -34,12 +36,16 @@ class Document(Base):
     #             ),
     #             default=DocumentType.RESUME,
     #         )
-    # uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
+    uploaded_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Relationships
     user = relationship("User", back_populates="documents")
     document_texts = relationship("DocumentText", back_populates="document", cascade="all, delete-orphan")
     profiles = relationship("Profile", back_populates="document")
+
+    __table_args__ = (
+        Index("ix_documents_user_id_uploaded_at", "user_id", desc("uploaded_at"), desc("id")),
+    )
     
     def __repr__(self):
         return f"<Document(id={self.id})>"
@@ -54,6 +60,7 @@ class DocumentText(Base):
     document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
     extracted_text = Column(Text, nullable=False)
     extraction_method = Column(String(50), default="pypdf2")
+    extracted_profile = Column(JSONB)  # cached extract_profile_from_text result
     extracted_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
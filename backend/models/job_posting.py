@@ -0,0 +1,63 @@
+"""
+Local index of job postings returned by the Adzuna API.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Text, Computed, Index
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.sql import func
+from database import Base
+
+
+class JobPosting(Base):
+    """A job posting seen in an Adzuna search result."""
+
+    __tablename__ = "job_postings"
+
+    id = Column(String(64), primary_key=True)  # Adzuna job id
+    country = Column(String(8), nullable=False)
+    title = Column(String(512), nullable=False)
+    company = Column(String(255))
+    location = Column(String(255))
+    category = Column(String(255))
+    description = Column(Text)
+    redirect_url = Column(Text)
+    salary_min = Column(Integer)
+    salary_max = Column(Integer)
+    created = Column(DateTime(timezone=True))  # posting date reported by Adzuna
+    raw = Column(JSONB, nullable=False)  # full JobResult payload
+    fetched_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(company, '') || ' ' || coalesce(category, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+            persisted=True,
+        ),
+    )
+
+    __table_args__ = (
+        Index("ix_job_postings_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_job_postings_country_expires_at", "country", "expires_at"),
+    )
+
+    def __repr__(self):
+        return f"<JobPosting(id={self.id})>"
+
+
+class JobSearchSlice(Base):
+    """
+    One Adzuna search (canonical params + page) and the ordered job ids it
+    returned, so a repeat search can be answered from `job_postings`.
+    """
+
+    __tablename__ = "job_search_slices"
+
+    key = Column(String(64), primary_key=True)  # sha256 of the canonical search key
+    country = Column(String(8), nullable=False)
+    job_ids = Column(JSONB, nullable=False, default=list)
+    total_records = Column(Integer, nullable=False, default=0)
+    fetched_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        return f"<JobSearchSlice(key={self.key})>"
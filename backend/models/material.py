@@ -2,7 +2,7 @@
 Generated material models for AI-generated application content.
 """
 import enum
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Text, Enum
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Text, Enum, Index, desc
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -26,11 +26,18 @@ class GeneratedMaterial(Base):
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     # material_type = Column(Enum(MaterialType), nullable=False)
     content = Column(Text, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Relationships (commented out)
     opportunity = relationship("Opportunity", back_populates="generated_materials")
     user = relationship("User", back_populates="generated_materials")
+
+    __table_args__ = (
+        Index(
+            "ix_generated_materials_opportunity_id_created_at",
+            "opportunity_id", desc("created_at"), desc("id"),
+        ),
+    )
     
     def __repr__(self):
         return f"<GeneratedMaterial(id={self.id})>"
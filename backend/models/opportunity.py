@@ -2,7 +2,8 @@
 Opportunity models for jobs, internships, scholarships, etc.
 """
 import enum
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Date, Boolean, CheckConstraint
+import hashlib
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Date, Boolean, CheckConstraint, Index, desc, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -42,18 +43,35 @@ class Opportunity(Base):
     status = Column(Enum(OpportunityStatus), default=OpportunityStatus.TO_APPLY)
     # type = Column(Enum(OpportunityType), default=OpportunityType.FULL_TIME)
     deadline = Column(Date)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships 
     user = relationship("User", back_populates="opportunities")
     requirements = relationship("OpportunityRequirement", back_populates="opportunity", cascade="all, delete-orphan")
     generated_materials = relationship("GeneratedMaterial", back_populates="opportunity", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index("ix_opportunities_user_id_created_at", "user_id", desc("created_at"), desc("id")),
+        # Status-filtered lists; rejected applications pile up and are
+        # rarely listed, so they are left out of the index
+        Index(
+            "ix_opportunities_user_id_status_active",
+            "user_id", "status", desc("created_at"), desc("id"),
+            postgresql_where=text("status <> 'REJECTED'"),
+        ),
+    )
     
     def __repr__(self):
         return f"<Opportunity(id={self.id})>"
 
 
+def requirement_text_hash(requirement_text: str) -> str:
+    """SHA-256 of the requirement text, ignoring case and whitespace differences."""
+    normalized = " ".join(requirement_text.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
 class OpportunityRequirement(Base):
     """Requirements parsed from opportunity descriptions."""
     
@@ -64,10 +82,20 @@ class OpportunityRequirement(Base):
     requirement_text = Column(Text, nullable=False)
     requirement_type = Column(String(100))
     is_mandatory = Column(Boolean, default=False)
+    text_hash = Column(String(64), nullable=False)  # requirement_text_hash(requirement_text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships 
     opportunity = relationship("Opportunity", back_populates="requirements")
+
+    __table_args__ = (
+        # Upsert key for re-analysis; also serves lookups by opportunity_id
+        Index(
+            "uq_opportunity_requirements_opportunity_id_text_hash",
+            "opportunity_id", "text_hash",
+            unique=True,
+        ),
+    )
     
     def __repr__(self):
         return f"<OpportunityRequirement(id={self.id})>"
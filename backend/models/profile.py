@@ -1,7 +1,7 @@
 """
 Profile model for user's structured resume data.
 """
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Index, desc
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -31,12 +31,17 @@ class Profile(Base):
     languages = Column(JSONB, default=list)
     certifications = Column(JSONB, default=list)
     awards = Column(JSONB, default=list)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
     user = relationship("User", back_populates="profiles")
     document = relationship("Document", back_populates="profiles")
+
+    __table_args__ = (
+        # "Latest profile" lookup behind every LLM-facing endpoint
+        Index("ix_profiles_user_id_created_at", "user_id", desc("created_at"), desc("id")),
+    )
     
     def __repr__(self):
         return f"<Profile(id={self.id}, user_id={self.user_id})>"
@@ -1,7 +1,7 @@
 """
 Router package initialization.
 """
-from . import auth, documents, profiles, opportunities, materials, llm_health_check, grants, jobs
+from . import auth, documents, profiles, opportunities, materials, llm_health_check, grants, jobs, search
 
 __all__ = [
     "auth", 
@@ -12,4 +12,5 @@ __all__ = [
     "llm_health_check", 
     "grants",
     "jobs",
+    "search",
     ]
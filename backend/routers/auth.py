@@ -7,8 +7,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import RedirectResponse
 from fastapi import Response
 from fastapi.security import HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
 from models.user import User
 from schemas.user import UserCreate, UserResponse, UserUpdate
 from services.auth_services import (
@@ -45,7 +46,7 @@ async def oauth_login(request: Request):
     return await oauth.auth0.authorize_redirect(request, redirect_uri)
 
 @router.get("/callback", name="oauth_callback")
-async def oauth_callback(request: Request, db=Depends(get_db)):
+async def oauth_callback(request: Request, db: AsyncSession = Depends(get_async_db)):
     """OAuth callback endpoint to handle authentication response."""
     logger.info("OAuth callback endpoint accessed.")
     token = await oauth.auth0.authorize_access_token(request)
@@ -55,7 +56,7 @@ async def oauth_callback(request: Request, db=Depends(get_db)):
     # print("User info received from Auth0:", user_info)
     
     # Check if user exists in the database
-    user = db.query(User).filter(User.email == user_info["email"]).first()
+    user = await db.scalar(select(User).where(User.email == user_info["email"]))
     
     if not user:
         # Create new user if not exists
@@ -66,8 +67,7 @@ async def oauth_callback(request: Request, db=Depends(get_db)):
             email=user_info["email"],
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
         logger.info(f"New OAuth user created: {user.email} (ID: {user.id})")
     else:
         logger.info(f"Existing OAuth user logged in: {user.email} (ID: {user.id})")
@@ -1,31 +1,165 @@
 """
 Document router for file uploads and text extraction.
 """
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status, Form
-from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
+import asyncio
+import json
+import logging
+import os
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query, status, Form, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from config import get_settings
+from database import get_async_db, AsyncSessionLocal
 from models.user import User
 from models.document import Document, DocumentText
 from models.profile import Profile
-from schemas.document import DocumentResponse, DocumentTextResponse
+from schemas.document import DocumentResponse, DocumentTextResponse, StorageUsageResponse
+from schemas.pagination import Page
+from schemas.profile import ProfileUpdate
 from services.llm_service import llm_service
-from services.auth_services import get_current_user
+from services.auth_services import get_current_user, get_current_user_readonly
+from services.storage_gc import remove_if_unreferenced, storage_gc
 from utils.file_utils import (
     validate_file,
     save_upload_file,
-    extract_text_from_file
 )
+from utils.extraction_pool import extraction_pool
+from utils.pagination import paginate
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/documents", tags=["Documents"])
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+async def _find_previous_extraction(db: AsyncSession, content_hash: str) -> Optional[DocumentText]:
+    """Most recent extraction of a file with the same contents, if any."""
+    return await db.scalar(
+        select(DocumentText)
+        .join(Document, Document.id == DocumentText.document_id)
+        .where(Document.content_hash == content_hash)
+        .order_by(DocumentText.extracted_profile.is_(None), DocumentText.id.desc())
+        .limit(1)
+    )
+
+
+def _busy_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Document processing is busy, please retry shortly",
+        headers={"Retry-After": "5"},
+    )
+
+
+async def _store_document(db: AsyncSession, file: UploadFile, doc_type: str, user_id: int) -> Document:
+    """Stream the upload to storage and create its Document row."""
+    file_path, file_size, content_hash = await save_upload_file(file, user_id)
+    
+    document = Document(
+        user_id=user_id,
+        filename=file.filename,
+        file_path=file_path,
+        file_size=file_size,
+        content_hash=content_hash,
+        doc_type=doc_type
+    )
+    db.add(document)
+    await db.commit()
+    return document
+
+
+async def _extract_document_text(db: AsyncSession, document: Document) -> DocumentText:
+    """Extract (or reuse) the text of a stored document."""
+    # Identical bytes were extracted before: reuse the text and, for
+    # resumes, the LLM profile instead of paying for both again
+    previous = await _find_previous_extraction(db, document.content_hash)
+    if previous:
+        extracted_text, method = previous.extracted_text, previous.extraction_method
+    else:
+        extracted_text, method = await extraction_pool.extract(document.file_path)
+    
+    document_text = DocumentText(
+        document_id=document.id,
+        extracted_text=extracted_text,
+        extraction_method=method,
+        extracted_profile=previous.extracted_profile if previous else None,
+    )
+    db.add(document_text)
+    await db.commit()
+    return document_text
+
+
+async def _resume_profile_data(document_text: DocumentText) -> ProfileUpdate:
+    """Profile fields for a resume: cached from an identical upload, else from the LLM."""
+    if document_text.extracted_profile is not None:
+        return ProfileUpdate(**document_text.extracted_profile)
+    # Use LLM to extract profile data
+    profile_data = await llm_service.extract_profile_from_text(document_text.extracted_text)
+    document_text.extracted_profile = profile_data.model_dump(mode="json", exclude_unset=True)
+    return profile_data
+
+
+async def _merge_profile(
+    db: AsyncSession,
+    user_id: int,
+    document: Document,
+    extracted_text: str,
+    profile_data: ProfileUpdate,
+) -> None:
+    """Create or update the user's profile from extracted resume data."""
+    print("extracted profile data: ", profile_data)
+    # Check if a profile exists for the user
+    user_profile = await db.scalar(select(Profile).where(Profile.user_id == user_id).limit(1))
+    print("existing user profile: ", user_profile)
+
+    if user_profile:
+        # Update existing profile (ignore full_text from LLM)
+        update_data = profile_data.dict(
+            exclude_unset=True,
+            exclude={"full_text"}
+        )
+        print("update data for profile: ", update_data)
+        for key, value in update_data.items():
+            setattr(user_profile, key, value)
+        # Always use our extracted_text, not whatever the LLM might say
+        user_profile.document_id = document.id
+        user_profile.full_text = extracted_text
+    else:
+        # Create new profile, ignore full_text from LLM data
+        base_data = profile_data.dict(
+            exclude_unset=True,
+            exclude={"full_text"}
+        )
+        user_profile = Profile(
+            **base_data,
+            user_id=user_id,
+            document_id=document.id,
+            full_text=extracted_text,  # always from our extraction
+        )
+        db.add(user_profile)
+    
+    await db.commit()
+
+
 @router.post("/upload", response_model=DocumentResponse, status_code=status.HTTP_201_CREATED)
 async def upload_document(
     file: UploadFile = File(...),
     doc_type: str = Form(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Upload a document. 
@@ -36,66 +170,19 @@ async def upload_document(
     print("current user is : ", current_user)
 
     validate_file(file)
+
+    # Shed load before accepting the upload rather than after storing it
+    if extraction_pool.is_saturated():
+        raise _busy_error()
     
-    file_path, file_size = await save_upload_file(file, current_user.id)
-    
-    document = Document(
-        user_id=current_user.id,
-        filename=file.filename,
-        file_path=file_path,
-        file_size=file_size,
-        doc_type=doc_type
-    )
-    db.add(document)
-    db.commit()
-    db.refresh(document)
+    document = await _store_document(db, file, doc_type, current_user.id)
     
     try:
-        extracted_text, method = extract_text_from_file(file_path)
-        
-        document_text = DocumentText(
-            document_id=document.id,
-            extracted_text=extracted_text,
-            extraction_method=method
-        )
-        db.add(document_text)
-        db.commit()
-
-        if doc_type == 'resume' and extracted_text:
-            # Use LLM to extract profile data
-            profile_data = await llm_service.extract_profile_from_text(extracted_text)
-            print("extracted profile data: ", profile_data)
-            # Check if a profile exists for the user
-            user_profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
-            print("existing user profile: ", user_profile)
-
-            if user_profile:
-                # Update existing profile (ignore full_text from LLM)
-                update_data = profile_data.dict(
-                    exclude_unset=True,
-                    exclude={"full_text"}
-                )
-                print("update data for profile: ", update_data)
-                for key, value in update_data.items():
-                    setattr(user_profile, key, value)
-                # Always use our extracted_text, not whatever the LLM might say
-                user_profile.document_id = document.id
-                user_profile.full_text = extracted_text
-            else:
-                # Create new profile, ignore full_text from LLM data
-                base_data = profile_data.dict(
-                    exclude_unset=True,
-                    exclude={"full_text"}
-                )
-                user_profile = Profile(
-                    **base_data,
-                    user_id=current_user.id,
-                    document_id=document.id,
-                    full_text=extracted_text,  # always from our extraction
-                )
-                db.add(user_profile)
-            
-            db.commit()
+        document_text = await _extract_document_text(db, document)
+
+        if doc_type == 'resume' and document_text.extracted_text:
+            profile_data = await _resume_profile_data(document_text)
+            await _merge_profile(db, current_user.id, document, document_text.extracted_text, profile_data)
 
     except Exception as e:
         # In a production environment, you'd want to log this error more robustly.
@@ -105,30 +192,194 @@ async def upload_document(
     return DocumentResponse.from_orm(document)
 
 
-@router.get("/", response_model=List[DocumentResponse])
-async def list_documents(
+async def _process_batch(
+    user_id: int,
+    stored: List[Tuple[int, str, int, str]],
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Extract and profile-merge stored batch documents concurrently.
+
+    `stored` holds (index, filename, document_id, doc_type) per stored file.
+    Each file runs in its own task with its own session, at most
+    BATCH_UPLOAD_CONCURRENCY (and never more than the extraction pool can
+    still queue) at a time; resume profiles are merged strictly in upload
+    order so the final profile does not depend on which extraction
+    finished first.
+    """
+    events: asyncio.Queue = asyncio.Queue()
+    merged = {index: asyncio.Event() for index, _, _, _ in stored}
+    # Slots are granted in upload order, so a file waiting for an earlier
+    # merge never holds a slot that earlier file still needs
+    slots = asyncio.Semaphore(max(min(settings.BATCH_UPLOAD_CONCURRENCY, extraction_pool.free_capacity()), 1))
+
+    async def process(index: int, filename: str, document_id: int, doc_type: str) -> None:
+        async with slots:
+            await process_one(index, filename, document_id, doc_type)
+
+    async def process_one(index: int, filename: str, document_id: int, doc_type: str) -> None:
+        db = AsyncSessionLocal()
+        try:
+            document = await db.get(Document, document_id)
+            document_text = await _extract_document_text(db, document)
+            await events.put({
+                "event": "extracted",
+                "index": index,
+                "document_id": document_id,
+                "extraction_method": document_text.extraction_method,
+                "characters": len(document_text.extracted_text),
+            })
+
+            if doc_type == 'resume' and document_text.extracted_text:
+                profile_data = await _resume_profile_data(document_text)
+                for earlier in (i for i in merged if i < index):
+                    await merged[earlier].wait()
+                await _merge_profile(db, user_id, document, document_text.extracted_text, profile_data)
+                await events.put({"event": "profile_updated", "index": index, "document_id": document_id})
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Batch upload: processing {filename} failed: {e}")
+            await events.put({"event": "error", "index": index, "filename": filename, "detail": str(e)})
+        finally:
+            merged[index].set()
+            await db.close()
+            await events.put(None)
+
+    tasks = [asyncio.ensure_future(process(*item)) for item in stored]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            event = await events.get()
+            if event is None:
+                remaining -= 1
+            else:
+                yield event
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@router.post("/upload-batch")
+async def upload_documents_batch(
+    files: List[UploadFile] = File(...),
+    doc_types: List[str] = Form(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Upload several documents at once.
+
+    `doc_types` holds either one type for every file or one per file.
+    Files are streamed to storage before the response starts; extraction
+    and resume profile updates then run concurrently and progress is
+    streamed back as NDJSON (one JSON object per line):
+    - `stored` with the new document_id (or `error`) for every file, first
+    - `extracted` / `profile_updated` / `error` per file as work completes
+    - a final `done` event with success and failure counts
+    """
+    if len(files) > settings.MAX_BATCH_UPLOAD_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many files. Maximum per batch: {settings.MAX_BATCH_UPLOAD_FILES}"
+        )
+    if len(doc_types) not in (1, len(files)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide one doc_type for all files or one per file"
+        )
+    if extraction_pool.is_saturated():
+        raise _busy_error()
+
+    types = doc_types * len(files) if len(doc_types) == 1 else doc_types
+    initial_events: List[Dict[str, Any]] = []
+    stored: List[Tuple[int, str, int, str]] = []
+    for index, (file, doc_type) in enumerate(zip(files, types)):
+        try:
+            validate_file(file)
+            document = await _store_document(db, file, doc_type, current_user.id)
+        except Exception as e:
+            await db.rollback()
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            initial_events.append({"event": "error", "index": index, "filename": file.filename, "detail": detail})
+            continue
+        stored.append((index, file.filename, document.id, doc_type))
+        initial_events.append({
+            "event": "stored",
+            "index": index,
+            "filename": file.filename,
+            "document_id": document.id,
+        })
+
+    user_id = current_user.id
+
+    async def ndjson_events():
+        failed = set()
+        for event in initial_events:
+            if event["event"] == "error":
+                failed.add(event["index"])
+            yield json.dumps(event) + "\n"
+        async for event in _process_batch(user_id, stored):
+            if event["event"] == "error":
+                failed.add(event["index"])
+            yield json.dumps(event) + "\n"
+        yield json.dumps({
+            "event": "done",
+            "succeeded": len(files) - len(failed),
+            "failed": len(failed),
+        }) + "\n"
+
+    return StreamingResponse(
+        ndjson_events(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/", response_model=Page[DocumentResponse])
+async def list_documents(
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List all documents for current user."""
-    documents = db.query(Document).filter(
-        Document.user_id == current_user.id
-    ).order_by(Document.uploaded_at.desc()).all()
+    """List documents for current user, newest first, one page at a time."""
+    documents, next_cursor = await paginate(
+        db,
+        select(Document).where(Document.user_id == current_user.id),
+        Document.uploaded_at, Document.id, cursor, limit
+    )
     
-    return [DocumentResponse.from_orm(doc) for doc in documents]
+    return Page(
+        items=[DocumentResponse.from_orm(doc) for doc in documents],
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/usage", response_model=StorageUsageResponse)
+async def get_storage_usage(
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Storage used by the current user's uploads."""
+    user_id = current_user.id
+    usage = await db.run_sync(lambda session: storage_gc.usage_by_user(session, user_id=user_id))
+    if not usage:
+        return StorageUsageResponse()
+    return StorageUsageResponse(**usage[0])
 
 
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific document."""
-    document = db.query(Document).filter(
-        Document.id == document_id,
-        Document.user_id == current_user.id
-    ).first()
+    document = await db.scalar(
+        select(Document).where(
+            Document.id == document_id,
+            Document.user_id == current_user.id
+        )
+    )
     
     if not document:
         raise HTTPException(
@@ -142,14 +393,16 @@ async def get_document(
 @router.get("/{document_id}/text", response_model=DocumentTextResponse)
 async def get_document_text(
     document_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get extracted text from a document."""
-    document = db.query(Document).filter(
-        Document.id == document_id,
-        Document.user_id == current_user.id
-    ).first()
+    document = await db.scalar(
+        select(Document).where(
+            Document.id == document_id,
+            Document.user_id == current_user.id
+        )
+    )
     
     if not document:
         raise HTTPException(
@@ -157,9 +410,11 @@ async def get_document_text(
             detail="Document not found"
         )
     
-    document_text = db.query(DocumentText).filter(
-        DocumentText.document_id == document_id
-    ).first()
+    document_text = await db.scalar(
+        select(DocumentText).where(
+            DocumentText.document_id == document_id
+        ).limit(1)
+    )
     
     if not document_text:
         raise HTTPException(
@@ -170,17 +425,68 @@ async def get_document_text(
     return DocumentTextResponse.from_orm(document_text)
 
 
+@router.get("/{document_id}/file")
+async def download_document_file(
+    document_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Download the original uploaded file.
+    
+    The content hash is the ETag, so unchanged files revalidate with a 304.
+    Range / If-Range requests are answered with partial content, letting
+    PDF viewers fetch pages incrementally. The body goes out through the
+    server's zero-copy path (ASGI pathsend) where the server supports it.
+    """
+    document = await db.scalar(
+        select(Document).where(
+            Document.id == document_id,
+            Document.user_id == current_user.id
+        )
+    )
+    
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+    
+    if not os.path.isfile(document.file_path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found"
+        )
+    
+    headers = {"Cache-Control": "private, max-age=86400"}
+    if document.content_hash:
+        etag = f'"{document.content_hash}"'
+        headers["ETag"] = etag
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return FileResponse(
+        document.file_path,
+        filename=document.filename,
+        headers=headers,
+        content_disposition_type="inline",
+    )
+
+
 @router.delete("/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_document(
     document_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a document."""
-    document = db.query(Document).filter(
-        Document.id == document_id,
-        Document.user_id == current_user.id
-    ).first()
+    document = await db.scalar(
+        select(Document).where(
+            Document.id == document_id,
+            Document.user_id == current_user.id
+        )
+    )
     
     if not document:
         raise HTTPException(
@@ -188,7 +494,12 @@ async def delete_document(
             detail="Document not found"
         )
     
-    db.delete(document)
-    db.commit()
+    file_path = document.file_path
+    await db.delete(document)
+    await db.commit()
+    
+    # Stored files are shared between identical uploads; only the last
+    # reference removes it (the GC grace period covers in-flight uploads)
+    await db.run_sync(remove_if_unreferenced, file_path)
     
     return None
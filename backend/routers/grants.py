@@ -1,8 +1,9 @@
 # routers/grants.py
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from services.auth_services import get_current_user
-from database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.auth_services import get_current_user, get_current_user_readonly
+from database import get_async_db
 from models.profile import Profile
 from models.user import User
 from schemas.grants import (
@@ -24,8 +25,8 @@ router = APIRouter(prefix="/grants", tags=["grants"])
 @router.get("/suggestions", response_model=GrantSuggestionsResponse)
 async def get_grant_suggestions(
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_readonly),
 ):
     """
     AI-driven endpoint:
@@ -34,10 +35,10 @@ async def get_grant_suggestions(
     - Calls Simpler.Grants.gov with opinionated filters
     - Returns suggested grant opportunities
     """
-    profile: Profile | None = (
-        db.query(Profile)
+    profile: Profile | None = await db.scalar(
+        select(Profile)
         .order_by(Profile.created_at.desc())
-        .first()
+        .limit(1)
     )
     print("fetche d profile:", profile)
 
@@ -75,15 +76,19 @@ async def get_grant_suggestions(
 @router.post("/search", response_model=GrantsSearchResponse)
 async def search_grants(
     body: GrantsSearchRequest,
+    enrich_top_n: int | None = Query(
+        None, ge=0, le=25, description="Fetch full details for the first N results"
+    ),
     current_user: User = Depends(get_current_user),
 ):
     """
     User-driven endpoint:
     - Frontend passes query + filters (type, status, agency, etc.)
     - Backend proxies to Simpler.Grants.gov and returns normalized results.
+    - The top N results are enriched with eligibility, award range and description.
     """
     try:
-        return await grants_service.search_grants(body)
+        return await grants_service.search_grants(body, enrich_top_n=enrich_top_n)
     except GrantsAuthError as e:
         raise HTTPException(status_code=500, detail=str(e))
     except GrantsUpstreamError as e:
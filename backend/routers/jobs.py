@@ -1,8 +1,9 @@
 # routers/jobs.py
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from services.auth_services import get_current_user
-from database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.auth_services import get_current_user, get_current_user_readonly
+from database import get_async_db
 from models.profile import Profile
 from models.user import User
 from schemas.jobs import (
@@ -15,6 +16,7 @@ from services.jobs_client import (
     JobsAuthError,
     JobsUpstreamError,
     JobsValidationError,
+    JobsQuotaExceededError,
     JobsClientError,
 )
 
@@ -25,8 +27,8 @@ router = APIRouter(prefix="/jobs", tags=["jobs"])
 async def get_job_suggestions(
     limit: int = Query(10, ge=1, le=50),
     country: str = Query("us", description="ISO country code (e.g., 'us', 'gb')"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_readonly),
 ):
     """
     AI-driven endpoint:
@@ -35,11 +37,11 @@ async def get_job_suggestions(
     - Calls Adzuna API with generated query
     - Returns suggested job opportunities
     """
-    profile: Profile | None = (
-        db.query(Profile)
-        .filter(Profile.user_id == current_user.id)
+    profile: Profile | None = await db.scalar(
+        select(Profile)
+        .where(Profile.user_id == current_user.id)
         .order_by(Profile.created_at.desc())
-        .first()
+        .limit(1)
     )
 
     if not profile or not profile.full_text:
@@ -54,6 +56,7 @@ async def get_job_suggestions(
             profile_text=profile.full_text,
             limit=limit,
             country=country,
+            db=db,
         )
     except JobsAuthError as e:
         # server configuration issue
@@ -67,6 +70,12 @@ async def get_job_suggestions(
         )
     except JobsValidationError as e:
         raise HTTPException(status_code=502, detail=str(e))
+    except JobsQuotaExceededError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(int(e.retry_after) + 1)},
+        )
     except JobsClientError as e:
         raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
@@ -76,15 +85,19 @@ async def get_job_suggestions(
 @router.post("/search", response_model=JobsSearchResponse)
 async def search_jobs(
     body: JobsSearchRequest,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     User-driven endpoint:
     - Frontend passes search parameters (what, where, filters, etc.)
     - Backend proxies to Adzuna API and returns normalized results.
+    - `countries` / `locations` fan out to concurrent searches that are
+      merged, deduped and ranked into one paginated list.
+    - Repeat searches are answered from the local job index while fresh.
     """
     try:
-        return await jobs_service.search_jobs(body)
+        return await jobs_service.search_jobs(body, db=db)
     except JobsAuthError as e:
         raise HTTPException(status_code=500, detail=str(e))
     except JobsUpstreamError as e:
@@ -95,10 +108,30 @@ async def search_jobs(
         )
     except JobsValidationError as e:
         raise HTTPException(status_code=502, detail=str(e))
+    except JobsQuotaExceededError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(int(e.retry_after) + 1)},
+        )
     except JobsClientError as e:
         raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
 
 
-
+@router.get("/{job_id}/similar", response_model=JobsSearchResponse)
+async def get_similar_jobs(
+    job_id: str,
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_readonly),
+):
+    """
+    "More like this": postings from the local job index similar to a job
+    previously returned by /jobs/search or /jobs/suggestions.
+    """
+    result = await jobs_service.similar_jobs(db, job_id, limit=limit)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Job not found in local index")
+    return result
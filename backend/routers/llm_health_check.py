@@ -4,7 +4,7 @@ import time
 from fastapi import APIRouter, status, HTTPException, Depends
 from fastapi.responses import JSONResponse
 from services.llm_client import llm_client
-from services.auth_services import get_current_user
+from services.auth_services import get_current_user_readonly
 from models.user import User
 
 router = APIRouter(prefix="/llm", tags=["LLM Health Check"])
@@ -12,7 +12,7 @@ logger = logging.getLogger(__name__)
 
 
 @router.get("/health-check", status_code=status.HTTP_200_OK)
-async def llm_health_check(current_user: User = Depends(get_current_user)):
+async def llm_health_check(current_user: User = Depends(get_current_user_readonly)):
     """Health check endpoint for LLM service (protected)."""
     logger.info("LLM health check endpoint called by user id=%s", current_user.id)
 
@@ -1,17 +1,23 @@
 """
 Materials router for generating application materials.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from config import get_settings
+from database import get_async_db
 from models.user import User
 from models.opportunity import Opportunity
 from models.profile import Profile
 from models.material import GeneratedMaterial, MaterialType
 from schemas.material import MaterialGenerateRequest, MaterialResponse
-from services.auth_services import get_current_user
+from schemas.pagination import Page
+from services.auth_services import get_current_user, get_current_user_readonly
 from services.llm_client import llm_client
+from utils.pagination import paginate
+
+settings = get_settings()
 
 router = APIRouter(prefix="/materials", tags=["Materials"])
 
@@ -20,14 +26,16 @@ router = APIRouter(prefix="/materials", tags=["Materials"])
 async def generate_materials(
     request: MaterialGenerateRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Generate application materials for an opportunity."""
     # Get opportunity
-    opportunity = db.query(Opportunity).filter(
-        Opportunity.id == request.opportunity_id,
-        Opportunity.user_id == current_user.id
-    ).first()
+    opportunity = await db.scalar(
+        select(Opportunity).where(
+            Opportunity.id == request.opportunity_id,
+            Opportunity.user_id == current_user.id
+        )
+    )
     
     if not opportunity:
         raise HTTPException(
@@ -37,14 +45,18 @@ async def generate_materials(
     
     # Get profile
     if request.profile_id:
-        profile = db.query(Profile).filter(
-            Profile.id == request.profile_id,
-            Profile.user_id == current_user.id
-        ).first()
+        profile = await db.scalar(
+            select(Profile).where(
+                Profile.id == request.profile_id,
+                Profile.user_id == current_user.id
+            )
+        )
     else:
-        profile = db.query(Profile).filter(
-            Profile.user_id == current_user.id
-        ).order_by(Profile.created_at.desc()).first()
+        profile = await db.scalar(
+            select(Profile).where(
+                Profile.user_id == current_user.id
+            ).order_by(Profile.created_at.desc()).limit(1)
+        )
     
     if not profile:
         raise HTTPException(
@@ -96,37 +108,38 @@ async def generate_materials(
                 content=content
             )
             
-            db.add(material)
             generated_materials.append(material)
         
-        db.commit()
-        
-        # Refresh all materials
-        for material in generated_materials:
-            db.refresh(material)
+        # One multi-row INSERT ... RETURNING for all of them
+        db.add_all(generated_materials)
+        await db.commit()
         
         return [MaterialResponse.from_orm(mat) for mat in generated_materials]
     
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Material generation failed: {str(e)}"
         )
 
 
-@router.get("/opportunity/{opportunity_id}", response_model=List[MaterialResponse])
+@router.get("/opportunity/{opportunity_id}", response_model=Page[MaterialResponse])
 async def get_materials_for_opportunity(
     opportunity_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all materials for an opportunity."""
+    """Get materials for an opportunity, newest first, one page at a time."""
     # Verify opportunity belongs to user
-    opportunity = db.query(Opportunity).filter(
-        Opportunity.id == opportunity_id,
-        Opportunity.user_id == current_user.id
-    ).first()
+    opportunity = await db.scalar(
+        select(Opportunity).where(
+            Opportunity.id == opportunity_id,
+            Opportunity.user_id == current_user.id
+        )
+    )
     
     if not opportunity:
         raise HTTPException(
@@ -134,24 +147,31 @@ async def get_materials_for_opportunity(
             detail="Opportunity not found"
         )
     
-    materials = db.query(GeneratedMaterial).filter(
-        GeneratedMaterial.opportunity_id == opportunity_id
-    ).order_by(GeneratedMaterial.created_at.desc()).all()
+    materials, next_cursor = await paginate(
+        db,
+        select(GeneratedMaterial).where(GeneratedMaterial.opportunity_id == opportunity_id),
+        GeneratedMaterial.created_at, GeneratedMaterial.id, cursor, limit
+    )
     
-    return [MaterialResponse.from_orm(mat) for mat in materials]
+    return Page(
+        items=[MaterialResponse.from_orm(mat) for mat in materials],
+        next_cursor=next_cursor
+    )
 
 
 @router.get("/{material_id}", response_model=MaterialResponse)
 async def get_material(
     material_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific generated material."""
-    material = db.query(GeneratedMaterial).filter(
-        GeneratedMaterial.id == material_id,
-        GeneratedMaterial.user_id == current_user.id
-    ).first()
+    material = await db.scalar(
+        select(GeneratedMaterial).where(
+            GeneratedMaterial.id == material_id,
+            GeneratedMaterial.user_id == current_user.id
+        )
+    )
     
     if not material:
         raise HTTPException(
@@ -166,13 +186,15 @@ async def get_material(
 async def delete_material(
     material_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a generated material."""
-    material = db.query(GeneratedMaterial).filter(
-        GeneratedMaterial.id == material_id,
-        GeneratedMaterial.user_id == current_user.id
-    ).first()
+    material = await db.scalar(
+        select(GeneratedMaterial).where(
+            GeneratedMaterial.id == material_id,
+            GeneratedMaterial.user_id == current_user.id
+        )
+    )
     
     if not material:
         raise HTTPException(
@@ -180,7 +202,7 @@ async def delete_material(
             detail="Material not found"
         )
     
-    db.delete(material)
-    db.commit()
+    await db.delete(material)
+    await db.commit()
     
     return None
@@ -1,12 +1,22 @@
 """
 Opportunities router for managing job/internship opportunities.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import delete, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import Optional
+from config import get_settings
+from database import get_async_db
 from models.user import User
-from models.opportunity import Opportunity, OpportunityRequirement, OpportunityStatus, OpportunityType
+from models.opportunity import (
+    Opportunity,
+    OpportunityRequirement,
+    OpportunityStatus,
+    OpportunityType,
+    requirement_text_hash
+)
 from models.profile import Profile
 from schemas.opportunity import (
     OpportunityCreate,
@@ -15,8 +25,13 @@ from schemas.opportunity import (
     OpportunityAnalysisRequest,
     OpportunityAnalysisResponse
 )
-from services.auth_services import get_current_user
+from schemas.pagination import Page
+from services.auth_services import get_current_user, get_current_user_readonly
 from services.llm_client import llm_client
+from utils.fieldsets import load_options, parse_fields, sparse_page
+from utils.pagination import paginate
+
+settings = get_settings()
 
 router = APIRouter(prefix="/opportunities", tags=["Opportunities"])
 
@@ -25,7 +40,7 @@ router = APIRouter(prefix="/opportunities", tags=["Opportunities"])
 async def create_opportunity(
     opp_data: OpportunityCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new opportunity."""
     opportunity = Opportunity(
@@ -36,12 +51,12 @@ async def create_opportunity(
         description=opp_data.description,
         deadline=opp_data.deadline,
         status=OpportunityStatus.TO_APPLY,
-        type=opp_data.type or OpportunityType.FULL_TIME
+        type=opp_data.type or OpportunityType.FULL_TIME,
+        requirements=[]
     )
     
     db.add(opportunity)
-    db.commit()
-    db.refresh(opportunity)
+    await db.commit()
     
     return OpportunityResponse.from_orm(opportunity)
 
@@ -50,20 +65,24 @@ async def create_opportunity(
 async def analyze_opportunity(
     analysis_request: OpportunityAnalysisRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Analyze fit between user profile and opportunity."""
     # Get profile
     if analysis_request.profile_id:
-        profile = db.query(Profile).filter(
-            Profile.id == analysis_request.profile_id,
-            Profile.user_id == current_user.id
-        ).first()
+        profile = await db.scalar(
+            select(Profile).where(
+                Profile.id == analysis_request.profile_id,
+                Profile.user_id == current_user.id
+            )
+        )
     else:
         # Get latest profile
-        profile = db.query(Profile).filter(
-            Profile.user_id == current_user.id
-        ).order_by(Profile.created_at.desc()).first()
+        profile = await db.scalar(
+            select(Profile).where(
+                Profile.user_id == current_user.id
+            ).order_by(Profile.created_at.desc()).limit(1)
+        )
     
     if not profile:
         raise HTTPException(
@@ -91,19 +110,63 @@ async def analyze_opportunity(
         )
 
 
+async def _replace_requirements(db: AsyncSession, opportunity_id: int, extracted: list) -> None:
+    """
+    Make the opportunity's requirements match the latest analysis.
+
+    One INSERT ... ON CONFLICT upserts the extracted requirements keyed on
+    their normalized text hash (rows already up to date are left alone) and
+    one DELETE removes those the analysis no longer mentions, so repeated
+    analyses never accumulate duplicates.
+    """
+    rows = {}
+    for req_data in extracted:
+        text_hash = requirement_text_hash(req_data["requirement_text"])
+        rows[text_hash] = {
+            "opportunity_id": opportunity_id,
+            "requirement_text": req_data["requirement_text"],
+            "requirement_type": req_data.get("requirement_type"),
+            "is_mandatory": req_data.get("is_mandatory", False),
+            "text_hash": text_hash,
+        }
+
+    if rows:
+        stmt = insert(OpportunityRequirement).values(list(rows.values()))
+        updatable = ("requirement_text", "requirement_type", "is_mandatory")
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[OpportunityRequirement.opportunity_id, OpportunityRequirement.text_hash],
+            set_={column: stmt.excluded[column] for column in updatable},
+            where=or_(*(
+                getattr(OpportunityRequirement, column).is_distinct_from(stmt.excluded[column])
+                for column in updatable
+            )),
+        ))
+
+    await db.execute(
+        delete(OpportunityRequirement).where(
+            OpportunityRequirement.opportunity_id == opportunity_id,
+            OpportunityRequirement.text_hash.not_in(list(rows))
+        )
+    )
+
+
 @router.post("/{opportunity_id}/analyze", response_model=OpportunityResponse)
 async def analyze_existing_opportunity(
     opportunity_id: int,
     profile_id: Optional[int] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Analyze an existing opportunity and update it with fit score."""
     # Get opportunity
-    opportunity = db.query(Opportunity).filter(
-        Opportunity.id == opportunity_id,
-        Opportunity.user_id == current_user.id
-    ).first()
+    opportunity = await db.scalar(
+        select(Opportunity).options(
+            selectinload(Opportunity.requirements)
+        ).where(
+            Opportunity.id == opportunity_id,
+            Opportunity.user_id == current_user.id
+        )
+    )
     
     if not opportunity:
         raise HTTPException(
@@ -113,14 +176,18 @@ async def analyze_existing_opportunity(
     
     # Get profile
     if profile_id:
-        profile = db.query(Profile).filter(
-            Profile.id == profile_id,
-            Profile.user_id == current_user.id
-        ).first()
+        profile = await db.scalar(
+            select(Profile).where(
+                Profile.id == profile_id,
+                Profile.user_id == current_user.id
+            )
+        )
     else:
-        profile = db.query(Profile).filter(
-            Profile.user_id == current_user.id
-        ).order_by(Profile.created_at.desc()).first()
+        profile = await db.scalar(
+            select(Profile).where(
+                Profile.user_id == current_user.id
+            ).order_by(Profile.created_at.desc()).limit(1)
+        )
     
     if not profile:
         raise HTTPException(
@@ -139,18 +206,11 @@ async def analyze_existing_opportunity(
         opportunity.fit_score = result["fit_score"]
         opportunity.fit_analysis = result["fit_analysis"]
         
-        # Add requirements
-        for req_data in result.get("extracted_requirements", []):
-            requirement = OpportunityRequirement(
-                opportunity_id=opportunity.id,
-                requirement_text=req_data["requirement_text"],
-                requirement_type=req_data.get("requirement_type"),
-                is_mandatory=req_data.get("is_mandatory", False)
-            )
-            db.add(requirement)
+        await _replace_requirements(db, opportunity.id, result.get("extracted_requirements", []))
         
-        db.commit()
-        db.refresh(opportunity)
+        await db.commit()
+        # Requirements were rewritten with bulk statements; reload just them
+        await db.refresh(opportunity, ["requirements"])
         
         return OpportunityResponse.from_orm(opportunity)
     
@@ -161,38 +221,58 @@ async def analyze_existing_opportunity(
         )
 
 
-@router.get("/", response_model=List[OpportunityResponse])
+@router.get("/", response_model=Page[OpportunityResponse])
 async def list_opportunities(
     status_filter: Optional[OpportunityStatus] = None,
     type_filter: Optional[OpportunityType] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,status"),
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List all opportunities for current user."""
-    query = db.query(Opportunity).filter(Opportunity.user_id == current_user.id)
+    """List opportunities for current user, newest first, one page at a time."""
+    selected = parse_fields(fields, OpportunityResponse)
+    query = select(Opportunity).where(Opportunity.user_id == current_user.id)
+    if selected:
+        # Requirements are only loaded when listed in `fields`
+        query = query.options(*load_options(Opportunity, selected, Opportunity.created_at))
+    else:
+        query = query.options(selectinload(Opportunity.requirements))
     
     if status_filter:
-        query = query.filter(Opportunity.status == status_filter)
+        query = query.where(Opportunity.status == status_filter)
     
     if type_filter:
-        query = query.filter(Opportunity.type == type_filter)
+        query = query.where(Opportunity.type == type_filter)
     
-    opportunities = query.order_by(Opportunity.created_at.desc()).all()
+    opportunities, next_cursor = await paginate(
+        db, query, Opportunity.created_at, Opportunity.id, cursor, limit
+    )
     
-    return [OpportunityResponse.from_orm(opp) for opp in opportunities]
+    if selected:
+        return sparse_page(OpportunityResponse, opportunities, selected, next_cursor)
+    return Page(
+        items=[OpportunityResponse.from_orm(opp) for opp in opportunities],
+        next_cursor=next_cursor
+    )
 
 
 @router.get("/{opportunity_id}", response_model=OpportunityResponse)
 async def get_opportunity(
     opportunity_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific opportunity."""
-    opportunity = db.query(Opportunity).filter(
-        Opportunity.id == opportunity_id,
-        Opportunity.user_id == current_user.id
-    ).first()
+    opportunity = await db.scalar(
+        select(Opportunity).options(
+            selectinload(Opportunity.requirements)
+        ).where(
+            Opportunity.id == opportunity_id,
+            Opportunity.user_id == current_user.id
+        )
+    )
     
     if not opportunity:
         raise HTTPException(
@@ -208,13 +288,17 @@ async def update_opportunity(
     opportunity_id: int,
     opp_data: OpportunityUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an opportunity."""
-    opportunity = db.query(Opportunity).filter(
-        Opportunity.id == opportunity_id,
-        Opportunity.user_id == current_user.id
-    ).first()
+    opportunity = await db.scalar(
+        select(Opportunity).options(
+            selectinload(Opportunity.requirements)
+        ).where(
+            Opportunity.id == opportunity_id,
+            Opportunity.user_id == current_user.id
+        )
+    )
     
     if not opportunity:
         raise HTTPException(
@@ -227,8 +311,7 @@ async def update_opportunity(
     for field, value in update_data.items():
         setattr(opportunity, field, value)
     
-    db.commit()
-    db.refresh(opportunity)
+    await db.commit()
     
     return OpportunityResponse.from_orm(opportunity)
 
@@ -237,13 +320,17 @@ async def update_opportunity(
 async def delete_opportunity(
     opportunity_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete an opportunity."""
-    opportunity = db.query(Opportunity).filter(
-        Opportunity.id == opportunity_id,
-        Opportunity.user_id == current_user.id
-    ).first()
+    opportunity = await db.scalar(
+        select(Opportunity).options(
+            selectinload(Opportunity.requirements)
+        ).where(
+            Opportunity.id == opportunity_id,
+            Opportunity.user_id == current_user.id
+        )
+    )
     
     if not opportunity:
         raise HTTPException(
@@ -251,7 +338,7 @@ async def delete_opportunity(
             detail="Opportunity not found"
         )
     
-    db.delete(opportunity)
-    db.commit()
+    await db.delete(opportunity)
+    await db.commit()
     
     return None
@@ -1,15 +1,22 @@
 """
 Profile router for managing user profiles.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from config import get_settings
+from database import get_async_db
 from models.user import User
 from models.profile import Profile
 from models.document import DocumentText
+from schemas.pagination import Page
 from schemas.profile import ProfileCreate, ProfileUpdate, ProfileResponse
-from services.auth_services import get_current_user
+from services.auth_services import get_current_user, get_current_user_readonly
+from utils.fieldsets import load_options, parse_fields, sparse_page
+from utils.pagination import paginate
+
+settings = get_settings()
 
 router = APIRouter(prefix="/profiles", tags=["Profiles"])
 
@@ -18,7 +25,7 @@ router = APIRouter(prefix="/profiles", tags=["Profiles"])
 async def create_profile(
     profile_data: ProfileCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new profile."""
     profile = Profile(
@@ -32,8 +39,7 @@ async def create_profile(
     )
     
     db.add(profile)
-    db.commit()
-    db.refresh(profile)
+    await db.commit()
     
     return ProfileResponse.from_orm(profile)
 
@@ -42,16 +48,18 @@ async def create_profile(
 async def create_profile_from_document(
     document_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a profile from a document's extracted text."""
     # Get document text
-    document_text = db.query(DocumentText).join(
-        DocumentText.document
-    ).filter(
-        DocumentText.document_id == document_id,
-        DocumentText.document.has(user_id=current_user.id)
-    ).first()
+    document_text = await db.scalar(
+        select(DocumentText).join(
+            DocumentText.document
+        ).where(
+            DocumentText.document_id == document_id,
+            DocumentText.document.has(user_id=current_user.id)
+        ).limit(1)
+    )
     
     if not document_text:
         raise HTTPException(
@@ -72,34 +80,48 @@ async def create_profile_from_document(
     )
     
     db.add(profile)
-    db.commit()
-    db.refresh(profile)
+    await db.commit()
     
     return ProfileResponse.from_orm(profile)
 
 
-@router.get("/", response_model=List[ProfileResponse])
+@router.get("/", response_model=Page[ProfileResponse])
 async def list_profiles(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,full_name,summary"),
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List all profiles for current user."""
-    profiles = db.query(Profile).filter(
-        Profile.user_id == current_user.id
-    ).order_by(Profile.created_at.desc()).all()
+    """List profiles for current user, newest first, one page at a time."""
+    selected = parse_fields(fields, ProfileResponse)
+    query = select(Profile).where(Profile.user_id == current_user.id)
+    if selected:
+        query = query.options(*load_options(Profile, selected, Profile.created_at))
+
+    profiles, next_cursor = await paginate(
+        db, query, Profile.created_at, Profile.id, cursor, limit
+    )
     
-    return [ProfileResponse.from_orm(prof) for prof in profiles]
+    if selected:
+        return sparse_page(ProfileResponse, profiles, selected, next_cursor)
+    return Page(
+        items=[ProfileResponse.from_orm(prof) for prof in profiles],
+        next_cursor=next_cursor
+    )
 
 
 @router.get("/latest", response_model=ProfileResponse)
 async def get_latest_profile(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get the most recent profile for current user."""
-    profile = db.query(Profile).filter(
-        Profile.user_id == current_user.id
-    ).order_by(Profile.created_at.desc()).first()
+    profile = await db.scalar(
+        select(Profile).where(
+            Profile.user_id == current_user.id
+        ).order_by(Profile.created_at.desc()).limit(1)
+    )
 
     print("latest profile: ", profile)
     
@@ -115,14 +137,16 @@ async def get_latest_profile(
 @router.get("/{profile_id}", response_model=ProfileResponse)
 async def get_profile(
     profile_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific profile."""
-    profile = db.query(Profile).filter(
-        Profile.id == profile_id,
-        Profile.user_id == current_user.id
-    ).first()
+    profile = await db.scalar(
+        select(Profile).where(
+            Profile.id == profile_id,
+            Profile.user_id == current_user.id
+        )
+    )
     
     if not profile:
         raise HTTPException(
@@ -138,13 +162,15 @@ async def update_profile(
     profile_id: int,
     profile_data: ProfileUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a profile."""
-    profile = db.query(Profile).filter(
-        Profile.id == profile_id,
-        Profile.user_id == current_user.id
-    ).first()
+    profile = await db.scalar(
+        select(Profile).where(
+            Profile.id == profile_id,
+            Profile.user_id == current_user.id
+        )
+    )
     
     if not profile:
         raise HTTPException(
@@ -157,8 +183,7 @@ async def update_profile(
     for field, value in update_data.items():
         setattr(profile, field, value)
     
-    db.commit()
-    db.refresh(profile)
+    await db.commit()
     
     return ProfileResponse.from_orm(profile)
 
@@ -167,13 +192,15 @@ async def update_profile(
 async def delete_profile(
     profile_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a profile."""
-    profile = db.query(Profile).filter(
-        Profile.id == profile_id,
-        Profile.user_id == current_user.id
-    ).first()
+    profile = await db.scalar(
+        select(Profile).where(
+            Profile.id == profile_id,
+            Profile.user_id == current_user.id
+        )
+    )
     
     if not profile:
         raise HTTPException(
@@ -181,7 +208,7 @@ async def delete_profile(
             detail="Profile not found"
         )
     
-    db.delete(profile)
-    db.commit()
+    await db.delete(profile)
+    await db.commit()
     
     return None
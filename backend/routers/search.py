@@ -0,0 +1,37 @@
+# routers/search.py
+import json
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from services.auth_services import get_current_user_readonly
+from database import AsyncSessionLocal
+from models.user import User
+from schemas.search import UnifiedSearchRequest
+from services.search_service import search_service
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.post("/unified")
+async def unified_search(
+    body: UnifiedSearchRequest,
+    current_user: User = Depends(get_current_user_readonly),
+):
+    """
+    Search grants and jobs concurrently from one query.
+
+    Streams NDJSON (one JSON object per line):
+    - a `grants` / `jobs` event with that source's results as soon as it answers
+    - an `error` event for a source that failed
+    - a final `merged` event with both sources ranked and deduped
+    """
+    async def ndjson_events():
+        # The stream outlives the request's dependencies, so it owns its session
+        async with AsyncSessionLocal() as db:
+            async for event in search_service.stream_unified(body, db=db):
+                yield json.dumps(event) + "\n"
+
+    return StreamingResponse(
+        ndjson_events(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -33,8 +33,9 @@ CREATE TABLE documents (
     filename VARCHAR(255) NOT NULL,
     file_path VARCHAR(512) NOT NULL,
     file_size INTEGER,
+    content_hash VARCHAR(64),
     doc_type document_type DEFAULT 'resume',
-    uploaded_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    uploaded_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT fk_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
@@ -44,6 +45,7 @@ CREATE TABLE document_texts (
     document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
     extracted_text TEXT NOT NULL,
     extraction_method VARCHAR(50) DEFAULT 'pypdf2',
+    extracted_profile JSONB,
     extracted_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT fk_document FOREIGN KEY (document_id) REFERENCES documents(id) ON DELETE CASCADE
 );
@@ -68,7 +70,7 @@ CREATE TABLE profiles (
     languages JSONB DEFAULT '[]',
     certifications JSONB DEFAULT '[]',
     awards JSONB DEFAULT '[]',
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT fk_profile_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     CONSTRAINT fk_profile_document FOREIGN KEY (document_id) REFERENCES documents(id) ON DELETE SET NULL
@@ -87,7 +89,7 @@ CREATE TABLE opportunities (
     status opportunity_status DEFAULT 'TO_APPLY',
     type opportunity_type DEFAULT 'FULL_TIME',
     deadline DATE,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT fk_opportunity_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
@@ -99,6 +101,7 @@ CREATE TABLE opportunity_requirements (
     requirement_text TEXT NOT NULL,
     requirement_type VARCHAR(100),
     is_mandatory BOOLEAN DEFAULT false,
+    text_hash VARCHAR(64) NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT fk_requirement_opportunity FOREIGN KEY (opportunity_id) REFERENCES opportunities(id) ON DELETE CASCADE
 );
@@ -110,19 +113,21 @@ CREATE TABLE generated_materials (
     user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     material_type material_type NOT NULL,
     content TEXT NOT NULL,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT fk_material_opportunity FOREIGN KEY (opportunity_id) REFERENCES opportunities(id) ON DELETE CASCADE,
     CONSTRAINT fk_material_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
 -- Indexes for performance
-CREATE INDEX idx_documents_user_id ON documents(user_id);
+CREATE INDEX ix_documents_user_id_uploaded_at ON documents(user_id, uploaded_at DESC, id DESC);
+CREATE INDEX idx_documents_content_hash ON documents(content_hash);
 CREATE INDEX idx_document_texts_document_id ON document_texts(document_id);
-CREATE INDEX idx_profiles_user_id ON profiles(user_id);
-CREATE INDEX idx_opportunities_user_id ON opportunities(user_id);
+CREATE INDEX ix_profiles_user_id_created_at ON profiles(user_id, created_at DESC, id DESC);
+CREATE INDEX ix_opportunities_user_id_created_at ON opportunities(user_id, created_at DESC, id DESC);
+CREATE INDEX ix_opportunities_user_id_status_active ON opportunities(user_id, status, created_at DESC, id DESC) WHERE status <> 'REJECTED';
 CREATE INDEX idx_opportunities_status ON opportunities(status);
-CREATE INDEX idx_opportunity_requirements_opportunity_id ON opportunity_requirements(opportunity_id);
-CREATE INDEX idx_generated_materials_opportunity_id ON generated_materials(opportunity_id);
+CREATE UNIQUE INDEX uq_opportunity_requirements_opportunity_id_text_hash ON opportunity_requirements(opportunity_id, text_hash);
+CREATE INDEX ix_generated_materials_opportunity_id_created_at ON generated_materials(opportunity_id, created_at DESC, id DESC);
 CREATE INDEX idx_generated_materials_user_id ON generated_materials(user_id);
 
 -- Update timestamp trigger function
@@ -17,6 +17,7 @@ from .material import (
     MaterialResponse,
     MaterialType
 )
+from .pagination import Page
 
 # Grants schemas
 from .grants import (
@@ -35,6 +36,7 @@ from .grants import (
     GrantAPIOpportunity,
     PaginationInfo,
     GrantsAPISearchResponse,
+    GrantsAPIOpportunityResponse,
 )
 
 
@@ -58,6 +60,7 @@ __all__ = [
     "MaterialGenerateRequest",
     "MaterialResponse",
     "MaterialType",
+    "Page",
     # Grants exports
     "SortOption",
     "PaginationReq",
@@ -74,4 +77,5 @@ __all__ = [
     "GrantAPIOpportunity",
     "PaginationInfo",
     "GrantsAPISearchResponse",
+    "GrantsAPIOpportunityResponse",
 ]
\ No newline at end of file
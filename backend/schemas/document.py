@@ -36,3 +36,10 @@ class DocumentTextResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class StorageUsageResponse(BaseModel):
+    """Schema for a user's upload storage usage."""
+    documents: int = 0
+    bytes: int = 0
+    unique_files: int = 0
@@ -150,6 +150,14 @@ class GrantsSearchItem(BaseModel):
     award_ceiling: Optional[float] = None
     is_cost_sharing: Optional[bool] = None
 
+    # Filled from the opportunity detail endpoint for the top-N results only
+    enriched: bool = False
+    description: Optional[str] = None
+    applicant_eligibility_description: Optional[str] = None
+    applicant_types: Optional[List[str]] = None
+    estimated_total_program_funding: Optional[float] = None
+    expected_number_of_awards: Optional[int] = None
+    additional_info_url: Optional[str] = None
 
 
 class GrantsSearchResponse(BaseModel):
@@ -187,6 +195,9 @@ class GrantAPIOpportunity(BaseModel):
 
     is_cost_sharing: Optional[bool] = None
 
+    # used to validate cached opportunity details
+    updated_at: Optional[str] = None
+
     class Config:
         extra = "allow"
 
@@ -201,3 +212,9 @@ class GrantsAPISearchResponse(BaseModel):
     message: str
     data: List[GrantAPIOpportunity]
     pagination_info: PaginationInfo
+
+
+class GrantsAPIOpportunityResponse(BaseModel):
+    """Response of GET /v1/opportunities/{opportunity_id}."""
+    message: str
+    data: GrantAPIOpportunity
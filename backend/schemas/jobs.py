@@ -2,7 +2,14 @@
 
 from datetime import date
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+
+# Max number of (country, location) combinations one search may fan out to
+MAX_FAN_OUT = 6
+# Max page * results_per_page of a fan-out search: every combination is
+# fetched this deep, so it bounds the upstream calls to 2 per combination
+MAX_FAN_OUT_DEPTH = 100
 
 
 # ---------- Search endpoint request/response ----------
@@ -34,6 +41,33 @@ class JobsSearchRequest(BaseModel):
     sort_by: Optional[str] = Field(None, description="Sort field (e.g., 'date', 'salary', 'relevance')")
     sort_dir: Optional[str] = Field(None, description="Sort direction ('asc' or 'desc')")
 
+    # Fan-out: search several countries and/or locations in one request
+    countries: Optional[List[str]] = Field(
+        None, min_length=1, max_length=MAX_FAN_OUT,
+        description="ISO country codes to search together (overrides `country`)",
+    )
+    locations: Optional[List[str]] = Field(
+        None, min_length=1, max_length=MAX_FAN_OUT,
+        description="Locations to search together (overrides `where`)",
+    )
+
+    @model_validator(mode="after")
+    def limit_fan_out(self):
+        """Keep countries x locations within MAX_FAN_OUT upstream searches, each at most MAX_FAN_OUT_DEPTH deep."""
+        combos = len(self.countries or [None]) * len(self.locations or [None])
+        if combos > MAX_FAN_OUT:
+            raise ValueError(
+                f"countries x locations must be at most {MAX_FAN_OUT} combinations (got {combos})"
+            )
+        if self.countries or self.locations:
+            depth = (self.page or 1) * (self.results_per_page or 10)
+            if depth > MAX_FAN_OUT_DEPTH:
+                raise ValueError(
+                    f"page x results_per_page must be at most {MAX_FAN_OUT_DEPTH} "
+                    f"when searching several countries or locations (got {depth})"
+                )
+        return self
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -140,6 +174,7 @@ class JobsSearchItem(BaseModel):
     category: Optional[str] = None
     contract_time: Optional[str] = None
     contract_type: Optional[str] = None
+    country: Optional[str] = None
 
 
 class JobsSearchResponse(BaseModel):
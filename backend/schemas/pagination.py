@@ -0,0 +1,13 @@
+"""
+Pagination schemas shared by list endpoints.
+"""
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """One page of a cursor-paginated list, newest first."""
+    items: List[T]
+    next_cursor: Optional[str] = None  # pass as ?cursor= for the next page; None on the last page
@@ -0,0 +1,52 @@
+# backend/schemas/search.py
+
+from typing import List, Optional, Literal
+from pydantic import BaseModel, Field
+
+from schemas.grants import Filters
+
+
+# ---------- Unified search (grants + jobs) ----------
+
+class UnifiedSearchRequest(BaseModel):
+    """One query fanned out to Simpler.Grants and Adzuna."""
+    query: str = Field(..., min_length=1, max_length=100, description="Keywords for both sources")
+    limit: int = Field(default=10, ge=1, le=50, description="Results per source")
+
+    # Jobs-only parameters
+    country: Optional[str] = Field(default="us", description="ISO country code for job search")
+    where: Optional[str] = Field(None, description="Job location")
+
+    # Grants-only parameters
+    grants_filters: Optional[Filters] = None
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "query": "machine learning",
+                "limit": 10,
+                "country": "us",
+                "where": "Boston",
+                "grants_filters": {"opportunity_status": {"one_of": ["posted"]}},
+            }
+        }
+
+
+class UnifiedSearchItem(BaseModel):
+    """Grant or job normalized to a common shape for the merged ranking."""
+    source: Literal["grant", "job"]
+    id: str
+    title: str
+    organization: Optional[str] = None
+    location: Optional[str] = None
+    posted: Optional[str] = None
+    deadline: Optional[str] = None
+    url: Optional[str] = None
+    rank: int = Field(..., description="Position within its own source's results")
+
+
+class UnifiedSearchMerged(BaseModel):
+    """Final event of the stream: both sources merged and deduped."""
+    event: Literal["merged"] = "merged"
+    sources: List[str] = Field(default_factory=list, description="Sources that answered")
+    items: List[UnifiedSearchItem] = Field(default_factory=list)
@@ -8,11 +8,14 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 from config import get_settings
-from database import get_db
+from database import get_async_db
 from fastapi import Request
 from models.user import User
+from utils.cache import TTLCache
 
 
 settings = get_settings()
@@ -25,6 +28,11 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # HTTP Bearer token security
 security = HTTPBearer()
 
+# Authenticated users by id, as column snapshots so no ORM instance is
+# shared between requests. Flushed updates/deletes evict the entry; other
+# processes see the change once AUTH_USER_CACHE_TTL expires.
+user_cache = TTLCache(max_entries=settings.AUTH_USER_CACHE_SIZE, ttl=settings.AUTH_USER_CACHE_TTL)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
@@ -91,10 +99,73 @@ def decode_access_token(token: str) -> dict:
         )
 
 
+def _detached_user(**columns) -> User:
+    """A User carrying `columns`, detached from any session."""
+    user = User(**columns)
+    make_transient_to_detached(user)
+    return user
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _evict_cached_user(mapper, connection, target: User) -> None:
+    user_cache.pop(target.id)
+
+
+async def _load_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    """Fetch a user by id, from the in-process cache when possible."""
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return _detached_user(**cached)
+
+    user = await db.get(User, user_id)
+    if user is not None and settings.AUTH_USER_CACHE_TTL > 0:
+        user_cache.set(user_id, {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs})
+    return user
+
+
+def _token_user_id(request: Request) -> int:
+    """
+    User id (`sub` claim) of the request's access token.
+
+    Raises:
+        HTTPException: If the token is missing or invalid
+    """
+    token_coockie = request.cookies.get("access_token")
+
+    if not token_coockie:
+        logger.warning("No access token cookie found in request.")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    # remove the Bearer prefix if present
+    token = token_coockie.removeprefix("Bearer ").strip()
+
+    payload = decode_access_token(token)
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials (missing subject)",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    try:
+        return int(user_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
 async def get_current_user(
     # credentials: HTTPAuthorizationCredentials = Depends(security),
     request: Request, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """
     Get the current authenticated user from JWT token.
@@ -109,29 +180,10 @@ async def get_current_user(
     Raises:
         HTTPException: If authentication fails
     """
-    token_coockie = request.cookies.get("access_token")
-
-    if not token_coockie:
-        logger.warning("No access token cookie found in request.")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    # remove the Bearer prefix if present
-    token = token_coockie.removeprefix("Bearer ").strip()
+    user_id = _token_user_id(request)
 
     try:
-        payload = decode_access_token(token)
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials (missing subject)",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        user = db.query(User).filter(User.id == int(user_id)).first()
+        user = await _load_user(db, user_id)
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -150,6 +202,22 @@ async def get_current_user(
         )       
 
 
+async def get_current_user_readonly(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    Current user for read-only endpoints that only need its id.
+
+    With AUTH_TRUST_TOKEN_CLAIMS the signed token is taken at its word: the
+    returned User is built from its claims (only `id` is set) without
+    checking that the user still exists. Otherwise same as get_current_user.
+    """
+    if settings.AUTH_TRUST_TOKEN_CLAIMS:
+        return _detached_user(id=_token_user_id(request))
+    return await get_current_user(request, db)
+
+
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     """
     Authenticate a user by email and password.
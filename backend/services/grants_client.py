@@ -12,6 +12,8 @@ from tenacity import (
     retry_if_exception_type,
 )
 from schemas.grants import (
+    GrantAPIOpportunity,
+    GrantsAPIOpportunityResponse,
     GrantsAPISearchResponse,
     GrantsSearchRequest,
     Filters,
@@ -136,6 +138,63 @@ class GrantsClient:
                     message=f"HTTP error contacting Simpler.Grants: {e}",
                 ) from e
 
+    def _opportunity_url(self, opportunity_id: str) -> str:
+        """Build GET /v1/opportunities/{id} from the configured search URL."""
+        base = (self.base_url or SIMPLE_GRANTS_DEFAULT_BASE_URL).rstrip("/")
+        base = base.removesuffix("/search")
+        return f"{base}/{opportunity_id}"
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type((httpx.HTTPError, httpx.TimeoutException)),
+    )
+    async def _get_opportunity(self, opportunity_id: str) -> Dict[str, Any]:
+        """Low-level GET /v1/opportunities/{opportunity_id} with retry."""
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            try:
+                resp = await client.get(
+                    self._opportunity_url(opportunity_id),
+                    headers=self._get_headers(),
+                )
+                resp.raise_for_status()
+                return resp.json()
+            except httpx.HTTPStatusError as e:
+                body = None
+                try:
+                    body = e.response.text
+                except Exception:
+                    pass
+                raise GrantsUpstreamError(
+                    status_code=e.response.status_code if e.response is not None else 0,
+                    message=f"Upstream HTTP error: {e}",
+                    body=body,
+                ) from e
+            except httpx.HTTPError as e:
+                raise GrantsUpstreamError(
+                    status_code=0,
+                    message=f"HTTP error contacting Simpler.Grants: {e}",
+                ) from e
+
+    async def get_opportunity(self, opportunity_id: str) -> GrantAPIOpportunity:
+        """Fetch the full record for a single opportunity."""
+        try:
+            raw = await self._get_opportunity(opportunity_id)
+        except GrantsClientError:
+            raise
+        except Exception as e:
+            raise GrantsClientError(f"Unexpected grants client error: {e}") from e
+
+        try:
+            return GrantsAPIOpportunityResponse.model_validate(raw).data
+        except ValidationError as e:
+            gv = GrantsValidationError(
+                f"Simpler.Grants opportunity {opportunity_id} validation failed"
+            )
+            gv.raw = raw
+            gv.validation = e
+            raise gv from e
+
     async def search(self, request: GrantsSearchRequest) -> GrantsAPISearchResponse:
         """Generic search used by /grants/search."""
         # Ensure that a default sort order is provided if none is specified
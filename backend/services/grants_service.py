@@ -1,6 +1,8 @@
 # services/grants_service.py
-from typing import List
-from services.grants_client import grants_client
+import asyncio
+from typing import Any, Dict, List, Optional
+from config import get_settings
+from services.grants_client import grants_client, GrantsClientError
 from services.llm_client import llm_client
 from schemas.grants import (
     GrantSuggestionsResponse,
@@ -9,14 +11,24 @@ from schemas.grants import (
     GrantsSearchResponse,
     GrantsSearchItem,
 )
-from schemas.grants import Filters, OneOfFilter, PaginationReq, SortOption
+from schemas.grants import Filters, OneOfFilter, PaginationReq, SortOption, GrantAPIOpportunity
+from utils.cache import TTLCache
 import logging
 
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
 
 class GrantsService:
     """Service for all grant-related logic."""
     def __init__(self):
         self.client = grants_client
+        # opportunity_id -> (updated_at, GrantAPIOpportunity)
+        self.detail_cache = TTLCache(
+            max_entries=settings.SIMPLE_GRANTS_DETAIL_CACHE_SIZE,
+            ttl=settings.SIMPLE_GRANTS_DETAIL_CACHE_TTL,
+        )
+        self._enrich_semaphore = asyncio.Semaphore(settings.SIMPLE_GRANTS_ENRICH_CONCURRENCY)
 
     async def get_suggestions_for_profile(
         self,
@@ -71,13 +83,77 @@ class GrantsService:
             items=items,
         )
 
+    async def _get_opportunity_detail(
+        self,
+        opp: GrantAPIOpportunity,
+    ) -> Optional[GrantAPIOpportunity]:
+        """
+        Return the full opportunity record, served from cache when the
+        search result's `updated_at` matches the cached copy.
+        Failures are logged and yield None so one bad record never fails the search.
+        """
+        cached = self.detail_cache.get(opp.opportunity_id)
+        if cached is not None:
+            cached_updated_at, detail = cached
+            if opp.updated_at is None or cached_updated_at == opp.updated_at:
+                return detail
+
+        async with self._enrich_semaphore:
+            try:
+                detail = await self.client.get_opportunity(opp.opportunity_id)
+            except GrantsClientError as e:
+                logger.warning(f"Grant detail fetch failed for {opp.opportunity_id}: {e}")
+                return None
+
+        self.detail_cache.set(opp.opportunity_id, (detail.updated_at or opp.updated_at, detail))
+        return detail
+
+    async def _enrich_items(
+        self,
+        opportunities: List[GrantAPIOpportunity],
+        items: List[GrantsSearchItem],
+        top_n: int,
+    ) -> None:
+        """Fetch details for the first `top_n` results concurrently and merge them into `items`."""
+        targets = opportunities[:top_n]
+        if not targets:
+            return
+
+        details = await asyncio.gather(*(self._get_opportunity_detail(opp) for opp in targets))
+
+        for item, detail in zip(items, details):
+            if detail is None:
+                continue
+            summary: Dict[str, Any] = detail.summary or {}
+            item.enriched = True
+            item.description = summary.get("summary_description") or detail.summary_description
+            item.applicant_eligibility_description = summary.get("applicant_eligibility_description")
+            item.applicant_types = summary.get("applicant_types") or detail.applicant_types
+            item.estimated_total_program_funding = (
+                summary.get("estimated_total_program_funding") or detail.estimated_total_program_funding
+            )
+            item.expected_number_of_awards = (
+                summary.get("expected_number_of_awards") or detail.expected_number_of_awards
+            )
+            item.additional_info_url = summary.get("additional_info_url")
+            item.award_floor = summary.get("award_floor", item.award_floor)
+            item.award_ceiling = summary.get("award_ceiling", item.award_ceiling)
+
     async def search_grants(
         self,
         request: GrantsSearchRequest,
+        enrich_top_n: Optional[int] = None,
     ) -> GrantsSearchResponse:
         """
         Used by /grants/search: user-driven search with explicit filters.
+
+        The first `enrich_top_n` results (default SIMPLE_GRANTS_ENRICH_TOP_N)
+        are enriched with eligibility, award and description fields from
+        the opportunity detail endpoint.
         """
+        if enrich_top_n is None:
+            enrich_top_n = settings.SIMPLE_GRANTS_ENRICH_TOP_N
+
         api_result = await self.client.search(request)
 
         items = [
@@ -97,13 +173,16 @@ class GrantsService:
                 # also from summary:
                 funding_instruments=opp.summary.get("funding_instruments"),
                 funding_categories=opp.summary.get("funding_categories"),
-                award_flooropp=opp.summary.get("award_floor"),
+                award_floor=opp.summary.get("award_floor"),
                 award_ceiling=opp.summary.get("award_ceiling"),
                 is_cost_sharing=opp.summary.get("is_cost_sharing"),
             )
             for opp in api_result.data
         ]
 
+        if enrich_top_n > 0:
+            await self._enrich_items(api_result.data, items, enrich_top_n)
+
         return GrantsSearchResponse(
             total_records=api_result.pagination_info.total_records,
             page_offset=api_result.pagination_info.page_offset,
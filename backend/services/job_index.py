@@ -0,0 +1,201 @@
+# services/job_index.py
+"""
+Local index of Adzuna job postings.
+
+Every search result is upserted into `job_postings` (full-text indexed),
+and each search is recorded as a slice of ordered job ids, so repeat
+searches, "more like this" and suggestion lookups can be served from
+Postgres. Only slices older than ADZUNA_SLICE_TTL (or whose postings
+have expired) are re-queried upstream.
+"""
+import hashlib
+import json
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import get_settings
+from models.job_posting import JobPosting, JobSearchSlice
+from schemas.jobs import JobResult, JobsAPISearchResponse
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def _parse_created(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        created = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return created if created.tzinfo else created.replace(tzinfo=timezone.utc)
+
+
+def _truncate(value: Optional[str], length: int) -> Optional[str]:
+    return value[:length] if value else None
+
+
+class JobIndex:
+    """Read/write access to the local job postings index."""
+
+    @staticmethod
+    def slice_key(search_key: Tuple) -> str:
+        """Stable hash of a canonical search key (see JobsClient.search_key)."""
+        return hashlib.sha256(json.dumps(search_key, default=str).encode()).hexdigest()
+
+    async def get_fresh_slice(self, db: AsyncSession, key: str) -> Optional[JobsAPISearchResponse]:
+        """
+        Return the stored result for a search if it is still fresh and all of
+        its postings are unexpired; otherwise None (caller re-queries Adzuna).
+        """
+        now = datetime.now(timezone.utc)
+        search_slice = await db.get(JobSearchSlice, key)
+        if search_slice is None:
+            return None
+        if search_slice.fetched_at < now - timedelta(seconds=settings.ADZUNA_SLICE_TTL):
+            return None
+
+        job_ids = search_slice.job_ids or []
+        rows = (await db.scalars(
+            select(JobPosting)
+            .where(JobPosting.id.in_(job_ids), JobPosting.expires_at > now)
+        )).all() if job_ids else []
+        if len(rows) < len(job_ids):
+            return None
+
+        by_id = {row.id: row for row in rows}
+        return JobsAPISearchResponse(
+            count=search_slice.total_records,
+            results=[JobResult.model_validate(by_id[job_id].raw) for job_id in job_ids],
+        )
+
+    async def store(self, db: AsyncSession, key: str, country: str, result: JobsAPISearchResponse) -> None:
+        """Upsert the postings in `result` and record the search slice."""
+        now = datetime.now(timezone.utc)
+        ttl = timedelta(days=settings.ADZUNA_POSTING_TTL_DAYS)
+
+        rows = {}
+        for job in result.results:
+            created = _parse_created(job.created)
+            rows[job.id] = {
+                "id": job.id,
+                "country": country,
+                "title": job.title[:512],
+                "company": _truncate(job.company.display_name if job.company else None, 255),
+                "location": _truncate(job.location.display_name if job.location else None, 255),
+                "category": _truncate(job.category.label if job.category else None, 255),
+                "description": job.description,
+                "redirect_url": job.redirect_url,
+                "salary_min": job.salary_min,
+                "salary_max": job.salary_max,
+                "created": created,
+                "raw": job.model_dump(mode="json"),
+                "expires_at": (created or now) + ttl,
+            }
+
+        if rows:
+            stmt = insert(JobPosting).values(list(rows.values()))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[JobPosting.id],
+                set_={
+                    **{
+                        column: stmt.excluded[column]
+                        for column in (
+                            "country", "title", "company", "location", "category",
+                            "description", "redirect_url", "salary_min", "salary_max",
+                            "created", "raw", "expires_at",
+                        )
+                    },
+                    "fetched_at": func.now(),
+                },
+            )
+            await db.execute(stmt)
+
+        slice_stmt = insert(JobSearchSlice).values(
+            key=key,
+            country=country,
+            job_ids=[job.id for job in result.results],
+            total_records=result.count or 0,
+            fetched_at=now,
+        )
+        slice_stmt = slice_stmt.on_conflict_do_update(
+            index_elements=[JobSearchSlice.key],
+            set_={
+                "job_ids": slice_stmt.excluded.job_ids,
+                "total_records": slice_stmt.excluded.total_records,
+                "fetched_at": slice_stmt.excluded.fetched_at,
+            },
+        )
+        await db.execute(slice_stmt)
+        await db.commit()
+
+    async def search_local(self, db: AsyncSession, text: str, country: str, limit: int = 10) -> List[JobResult]:
+        """Full-text search over unexpired postings, best matches first."""
+        query = func.websearch_to_tsquery("english", text)
+        rows = (await db.scalars(
+            select(JobPosting)
+            .where(
+                JobPosting.country == country,
+                JobPosting.expires_at > func.now(),
+                JobPosting.search_vector.op("@@")(query),
+            )
+            .order_by(
+                func.ts_rank_cd(JobPosting.search_vector, query).desc(),
+                JobPosting.created.desc().nullslast(),
+            )
+            .limit(limit)
+        )).all()
+        return [JobResult.model_validate(row.raw) for row in rows]
+
+    async def more_like_this(self, db: AsyncSession, job_id: str, limit: int = 10) -> Optional[List[JobResult]]:
+        """
+        Postings similar to `job_id`, ranked by overlap with its title and
+        category terms. Returns None if the job is not in the index.
+        """
+        posting = await db.get(JobPosting, job_id)
+        if posting is None:
+            return None
+
+        terms = []
+        for token in re.findall(r"[a-z0-9]+", f"{posting.title} {posting.category or ''}".lower()):
+            if len(token) > 2 and token not in terms:
+                terms.append(token)
+        if not terms:
+            return []
+
+        query = func.to_tsquery("english", " | ".join(terms[:12]))
+        rows = (await db.scalars(
+            select(JobPosting)
+            .where(
+                JobPosting.id != job_id,
+                JobPosting.country == posting.country,
+                JobPosting.expires_at > func.now(),
+                JobPosting.search_vector.op("@@")(query),
+            )
+            .order_by(func.ts_rank_cd(JobPosting.search_vector, query).desc())
+            .limit(limit)
+        )).all()
+        return [JobResult.model_validate(row.raw) for row in rows]
+
+    async def purge_expired(self, db: AsyncSession) -> int:
+        """Delete expired postings; returns the number removed."""
+        result = await db.execute(
+            delete(JobPosting)
+            .where(JobPosting.expires_at <= func.now())
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        removed = result.rowcount
+        if removed:
+            logger.info(f"Purged {removed} expired job postings")
+        return removed
+
+
+# Global index instance
+job_index = JobIndex()
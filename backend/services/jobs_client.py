@@ -1,23 +1,31 @@
 # services/jobs_client.py
 """
-Client for Adzuna Job Search API with retry logic and async HTTP.
+Client for Adzuna Job Search API with retry logic, a pooled async HTTP
+client and a quota-aware call budget.
 """
-from typing import List, Optional, Dict, Any
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import List, Optional, Dict, Any, Tuple
 import httpx
 from pydantic import ValidationError
 from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential,
-    retry_if_exception_type,
+    retry_if_exception,
 )
 from schemas.jobs import (
     JobsSearchRequest,
     JobsAPISearchResponse,
 )
 from config import get_settings
+from utils.cache import TTLCache
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 ADZUNA_DEFAULT_BASE_URL = "https://api.adzuna.com/v1"
 
@@ -44,6 +52,113 @@ class JobsValidationError(JobsClientError):
     """Returned when upstream response cannot be parsed/validated."""
 
 
+class JobsQuotaExceededError(JobsClientError):
+    """Adzuna call budget exhausted for the current window."""
+
+    def __init__(self, message: str, retry_after: float = 60.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Retry only network errors and 5xx responses, never quota/auth/4xx."""
+    return isinstance(exc, JobsUpstreamError) and (
+        exc.status_code == 0 or exc.status_code >= 500
+    )
+
+
+# ---------- Quota budget ----------
+
+class QuotaBudget:
+    """
+    Tracks Adzuna calls against per-minute and per-day quotas.
+
+    The minute window is sliding; the day window resets at UTC midnight,
+    matching how Adzuna counts usage. A fraction of each window is held
+    back for interactive searches so background work (e.g. suggestion
+    refreshes) cannot exhaust the quota for users.
+    """
+
+    def __init__(self, per_minute: int, per_day: int, interactive_reserve: float = 0.2) -> None:
+        self.per_minute = per_minute
+        self.per_day = per_day
+        self.minute_reserve = int(per_minute * interactive_reserve)
+        self.day_reserve = int(per_day * interactive_reserve)
+        self._minute_calls: deque[float] = deque()
+        self._day = self._today()
+        self._day_calls = 0
+        self._blocked_until = 0.0
+
+    @staticmethod
+    def _today():
+        return datetime.now(timezone.utc).date()
+
+    def _roll_windows(self) -> None:
+        now = time.monotonic()
+        while self._minute_calls and now - self._minute_calls[0] >= 60:
+            self._minute_calls.popleft()
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._day_calls = 0
+
+    def remaining_minute(self) -> int:
+        self._roll_windows()
+        return max(self.per_minute - len(self._minute_calls), 0)
+
+    def remaining_day(self) -> int:
+        self._roll_windows()
+        return max(self.per_day - self._day_calls, 0)
+
+    def is_low(self) -> bool:
+        """True once only the interactive reserve is left."""
+        return (
+            self.remaining_day() <= self.day_reserve
+            or self.remaining_minute() <= self.minute_reserve
+            or time.monotonic() < self._blocked_until
+        )
+
+    def retry_after(self) -> float:
+        """Seconds until the next call is likely to be allowed."""
+        now = time.monotonic()
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if self.remaining_day() == 0:
+            midnight = datetime.combine(self._day, datetime.min.time(), tzinfo=timezone.utc)
+            return 86400 - (datetime.now(timezone.utc) - midnight).total_seconds()
+        if self._minute_calls:
+            return max(60 - (now - self._minute_calls[0]), 0.0)
+        return 0.0
+
+    def try_acquire(self, interactive: bool = True) -> bool:
+        """Reserve one call; returns False if the budget does not allow it."""
+        self._roll_windows()
+        if time.monotonic() < self._blocked_until:
+            return False
+
+        minute_floor = 0 if interactive else self.minute_reserve
+        day_floor = 0 if interactive else self.day_reserve
+        if self.remaining_minute() <= minute_floor or self.remaining_day() <= day_floor:
+            return False
+
+        self._minute_calls.append(time.monotonic())
+        self._day_calls += 1
+        return True
+
+    def note_rate_limited(self, retry_after: float) -> None:
+        """Upstream said 429: stop calling until `retry_after` has elapsed."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "remaining_minute": self.remaining_minute(),
+            "remaining_day": self.remaining_day(),
+            "per_minute": self.per_minute,
+            "per_day": self.per_day,
+            "is_low": self.is_low(),
+        }
+
+
 # ---------- Client class ----------
 
 class JobsClient:
@@ -60,6 +175,36 @@ class JobsClient:
         )
         self.timeout: float = getattr(settings, "ADZUNA_TIMEOUT", 20.0)
         self.max_retries: int = getattr(settings, "ADZUNA_MAX_RETRIES", 3)
+        self.budget = QuotaBudget(
+            per_minute=settings.ADZUNA_CALLS_PER_MINUTE,
+            per_day=settings.ADZUNA_CALLS_PER_DAY,
+            interactive_reserve=settings.ADZUNA_INTERACTIVE_RESERVE,
+        )
+        self._http: Optional[httpx.AsyncClient] = None
+        # canonical search key -> JobsAPISearchResponse
+        self._search_cache = TTLCache(
+            max_entries=settings.ADZUNA_SEARCH_CACHE_SIZE,
+            ttl=settings.ADZUNA_SEARCH_CACHE_TTL,
+        )
+        self._inflight: Dict[Tuple, "asyncio.Future[JobsAPISearchResponse]"] = {}
+
+    def _get_http(self) -> httpx.AsyncClient:
+        """Shared keep-alive client, created lazily inside the running loop."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=settings.ADZUNA_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.ADZUNA_MAX_CONNECTIONS,
+                ),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client (called on app shutdown)."""
+        if self._http is not None and not self._http.is_closed:
+            await self._http.aclose()
+        self._http = None
 
     def _get_auth_params(self) -> Dict[str, str]:
         """Get authentication query parameters."""
@@ -73,120 +218,201 @@ class JobsClient:
         }
 
     @retry(
-        stop=stop_after_attempt(3),
+        stop=stop_after_attempt(settings.ADZUNA_MAX_RETRIES),
         wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((httpx.HTTPError, httpx.TimeoutException)),
+        retry=retry_if_exception(_is_retryable),
+        reraise=True,
     )
     async def _get_search(
         self,
         country: str,
         page: int,
-        params: Dict[str, Any]
+        params: Dict[str, Any],
+        interactive: bool = True,
     ) -> Dict[str, Any]:
-        """Low-level GET /jobs/{country}/search/{page} with retry."""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        """
+        Low-level GET /jobs/{country}/search/{page} with retry.
+        Every attempt (including retries) is charged against the quota budget.
+        """
+        # Add auth params (fails fast without charging the budget)
+        query_params = {**self._get_auth_params(), **params}
+
+        if not self.budget.try_acquire(interactive=interactive):
+            raise JobsQuotaExceededError(
+                "Adzuna call budget exhausted"
+                + ("" if interactive else " (reserved for interactive searches)"),
+                retry_after=self.budget.retry_after(),
+            )
+
+        client = self._get_http()
+        try:
+            # Build URL - Adzuna API format: /v1/api/jobs/{country}/search/{page}
+            # Ensure base_url doesn't have trailing slash
+            base = self.base_url.rstrip('/')
+            url = f"{base}/api/jobs/{country}/search/{page}"
+
+            logger.debug(f"Adzuna API request URL: {url}")
+            logger.debug(f"Adzuna API request params: {list(query_params.keys())}")
+
+            resp = await client.get(url, params=query_params)
+            resp.raise_for_status()
+            return resp.json()
+        except httpx.HTTPStatusError as e:
+            # upstream returned 4xx/5xx
+            body = None
             try:
-                # Add auth params
-                query_params = {**self._get_auth_params(), **params}
-                
-                # Build URL - Adzuna API format: /v1/api/jobs/{country}/search/{page}
-                # Ensure base_url doesn't have trailing slash
-                base = self.base_url.rstrip('/')
-                url = f"{base}/api/jobs/{country}/search/{page}"
-                
-                # Debug logging
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.debug(f"Adzuna API request URL: {url}")
-                logger.debug(f"Adzuna API request params: {list(query_params.keys())}")
-                
-                resp = await client.get(url, params=query_params)
-                resp.raise_for_status()
-                return resp.json()
-            except httpx.HTTPStatusError as e:
-                # upstream returned 4xx/5xx
-                body = None
+                body = e.response.text
+            except Exception:
+                pass
+
+            # Handle specific Adzuna error codes
+            if e.response.status_code == 410:
+                raise JobsAuthError(
+                    f"Adzuna API authorization failed: {e}"
+                ) from e
+            elif e.response.status_code == 400:
+                raise JobsValidationError(
+                    f"Invalid request parameters: {e}"
+                ) from e
+            elif e.response.status_code == 429:
                 try:
-                    body = e.response.text
-                except Exception:
-                    pass
-                
-                # Handle specific Adzuna error codes
-                if e.response.status_code == 410:
-                    raise JobsAuthError(
-                        f"Adzuna API authorization failed: {e}"
-                    ) from e
-                elif e.response.status_code == 400:
-                    raise JobsValidationError(
-                        f"Invalid request parameters: {e}"
-                    ) from e
-                else:
-                    raise JobsUpstreamError(
-                        status_code=e.response.status_code if e.response is not None else 0,
-                        message=f"Upstream HTTP error: {e}",
-                        body=body,
-                    ) from e
-            except httpx.HTTPError as e:
-                # network / timeout / connection errors
+                    retry_after = float(e.response.headers.get("Retry-After", 60))
+                except ValueError:
+                    retry_after = 60.0
+                self.budget.note_rate_limited(retry_after)
+                raise JobsQuotaExceededError(
+                    f"Adzuna rate limit hit: {e}",
+                    retry_after=retry_after,
+                ) from e
+            else:
                 raise JobsUpstreamError(
-                    status_code=0,
-                    message=f"HTTP error contacting Adzuna: {e}",
+                    status_code=e.response.status_code if e.response is not None else 0,
+                    message=f"Upstream HTTP error: {e}",
+                    body=body,
                 ) from e
+        except httpx.HTTPError as e:
+            # network / timeout / connection errors
+            raise JobsUpstreamError(
+                status_code=0,
+                message=f"HTTP error contacting Adzuna: {e}",
+            ) from e
+
+    @staticmethod
+    def _build_params(request: JobsSearchRequest) -> Tuple[str, int, Dict[str, Any]]:
+        """Translate a JobsSearchRequest into (country, page, query params) minus auth."""
+        # Build query parameters from request
+        params = {}
+
+        # Basic search parameters (keep it simple)
+        if request.what:
+            params["what"] = request.what
+        if request.where:
+            params["where"] = request.where
+        if request.distance:
+            params["distance"] = request.distance
+        if request.category:
+            params["category"] = request.category
+        if request.salary_min:
+            params["salary_min"] = request.salary_min
+        if request.salary_max:
+            params["salary_max"] = request.salary_max
+        if request.full_time:
+            params["full_time"] = "1" if request.full_time else "0"
+        if request.part_time:
+            params["part_time"] = "1" if request.part_time else "0"
+        if request.contract:
+            params["contract"] = "1" if request.contract else "0"
+        if request.permanent:
+            params["permanent"] = "1" if request.permanent else "0"
+        if request.max_days_old:
+            params["max_days_old"] = request.max_days_old
+        if request.sort_by:
+            params["sort_by"] = request.sort_by
+        if request.sort_dir:
+            params["sort_dir"] = request.sort_dir
+
+        # Pagination
+        params["results_per_page"] = request.results_per_page or 10
 
-    async def search(self, request: JobsSearchRequest) -> JobsAPISearchResponse:
-        """Generic search used by /jobs/search."""
+        # Default country to 'us' if not specified
+        country = request.country or "us"
+        page = request.page or 1
+        return country, page, params
+
+    @staticmethod
+    def _cache_key(country: str, page: int, params: Dict[str, Any]) -> Tuple:
+        """
+        Canonical cache key: sorted params with case and whitespace folded,
+        so "Software  Engineer" and "software engineer" share an entry.
+        """
+        normalized = tuple(sorted(
+            (name, " ".join(str(value).lower().split()))
+            for name, value in params.items()
+        ))
+        return (country.lower(), page, normalized)
+
+    def search_key(self, request: JobsSearchRequest) -> Tuple:
+        """Canonical identity of a search (used by the local job index)."""
+        return self._cache_key(*self._build_params(request))
+
+    async def search(
+        self,
+        request: JobsSearchRequest,
+        interactive: bool = True,
+    ) -> JobsAPISearchResponse:
+        """
+        Generic search used by /jobs/search.
+
+        Results are cached by canonicalized params, and concurrent identical
+        searches share one upstream call. Pass interactive=False for
+        background work so it cannot eat into the quota reserved for
+        user-initiated searches. An interactive search only joins another
+        interactive call, which is allowed to spend that reserve; background
+        searches join either kind.
+        """
+        country, page, params = self._build_params(request)
+        key = self._cache_key(country, page, params)
+
+        cached = self._search_cache.get(key)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get((key, True))
+        if task is None and not interactive:
+            task = self._inflight.get((key, False))
+        if task is None:
+            inflight_key = (key, interactive)
+            task = asyncio.ensure_future(
+                self._search_uncached(key, country, page, params, interactive)
+            )
+            self._inflight[inflight_key] = task
+            task.add_done_callback(lambda _t, k=inflight_key: self._inflight.pop(k, None))
+
+        # shield: one caller disconnecting must not cancel the shared call
+        return await asyncio.shield(task)
+
+    async def _search_uncached(
+        self,
+        key: Tuple,
+        country: str,
+        page: int,
+        params: Dict[str, Any],
+        interactive: bool,
+    ) -> JobsAPISearchResponse:
+        """Call Adzuna, validate the response and populate the result cache."""
         try:
-            # Build query parameters from request
-            params = {}
-            
-            # Basic search parameters (keep it simple)
-            if request.what:
-                params["what"] = request.what
-            if request.where:
-                params["where"] = request.where
-            if request.distance:
-                params["distance"] = request.distance
-            if request.category:
-                params["category"] = request.category
-            if request.salary_min:
-                params["salary_min"] = request.salary_min
-            if request.salary_max:
-                params["salary_max"] = request.salary_max
-            if request.full_time:
-                params["full_time"] = "1" if request.full_time else "0"
-            if request.part_time:
-                params["part_time"] = "1" if request.part_time else "0"
-            if request.contract:
-                params["contract"] = "1" if request.contract else "0"
-            if request.permanent:
-                params["permanent"] = "1" if request.permanent else "0"
-            if request.max_days_old:
-                params["max_days_old"] = request.max_days_old
-            if request.sort_by:
-                params["sort_by"] = request.sort_by
-            if request.sort_dir:
-                params["sort_dir"] = request.sort_dir
-            
-            # Pagination
-            params["results_per_page"] = request.results_per_page or 10
-            
-            # Default country to 'us' if not specified
-            country = request.country or "us"
-            page = request.page or 1
-            
-            raw = await self._get_search(country, page, params)
+            raw = await self._get_search(country, page, params, interactive=interactive)
         except JobsClientError:
             # propagate our known client exceptions
             raise
         except Exception as e:
             # Wrap any unexpected error
             raise JobsClientError(f"Unexpected jobs client error: {e}") from e
-        
+
         try:
-            return JobsAPISearchResponse.model_validate(raw)
+            result = JobsAPISearchResponse.model_validate(raw)
         except ValidationError as e:
-            import json, logging
-            logger = logging.getLogger(__name__)
+            import json
             # pretty-print raw response for logs
             try:
                 pretty_raw = json.dumps(raw, indent=2, ensure_ascii=False)
@@ -208,6 +434,9 @@ class JobsClient:
             jv.validation = e
             raise jv from e
 
+        self._search_cache.set(key, result)
+        return result
+
 
 # Global client instance (same pattern as grants_client)
 jobs_client = JobsClient()
@@ -1,6 +1,14 @@
 # services/jobs_service.py
-from typing import List
-from services.jobs_client import jobs_client
+import asyncio
+import math
+import re
+from typing import List, Optional, Tuple
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import get_settings
+from database import AsyncSessionLocal
+from services.jobs_client import jobs_client, JobsQuotaExceededError
+from services.job_index import job_index
 from services.llm_client import llm_client
 from schemas.jobs import (
     JobSuggestionsResponse,
@@ -8,14 +16,64 @@ from schemas.jobs import (
     JobsSearchRequest,
     JobsSearchResponse,
     JobsSearchItem,
+    JobResult,
+    JobsAPISearchResponse,
 )
+from utils.cache import TTLCache
 import logging
 
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Adzuna caps results_per_page at 50
+ADZUNA_MAX_PAGE_SIZE = 50
+
+_COMPANY_SUFFIXES = re.compile(r"\b(inc|llc|ltd|limited|corp|corporation|co|company|plc|gmbh)\b")
+
+
+def _fuzzy_job_key(title: str, company: Optional[str]) -> Optional[Tuple[str, str]]:
+    """
+    Normalized (title, company) used to spot the same posting listed under
+    different ids (e.g. per-country copies). None when there is no company,
+    since a bare title is too weak to dedupe on.
+    """
+    if not company:
+        return None
+
+    def norm(value: str) -> str:
+        value = re.sub(r"[^a-z0-9 ]+", " ", value.lower())
+        return " ".join(value.split())
+
+    return norm(title), " ".join(_COMPANY_SUFFIXES.sub(" ", norm(company)).split())
+
+
+def _to_search_item(job: JobResult, country: Optional[str] = None) -> JobsSearchItem:
+    return JobsSearchItem(
+        id=job.id,
+        title=job.title,
+        company=job.company.display_name if job.company else None,
+        location=job.location.display_name if job.location else None,
+        salary_min=job.salary_min,
+        salary_max=job.salary_max,
+        description=job.description,
+        redirect_url=job.redirect_url,
+        created=job.created,
+        category=job.category.label if job.category else None,
+        contract_time=job.contract_time,
+        contract_type=job.contract_type,
+        country=country,
+    )
+
 
 class JobsService:
     """Service for all job-related logic."""
     def __init__(self):
         self.client = jobs_client
+        # (profile_id, country, limit) -> last good JobSuggestionsResponse
+        self.suggestions_cache = TTLCache(
+            max_entries=1024,
+            ttl=settings.ADZUNA_SUGGESTIONS_CACHE_TTL,
+        )
 
     async def get_suggestions_for_profile(
         self,
@@ -23,13 +81,24 @@ class JobsService:
         profile_text: str,
         limit: int = 10,
         country: str = "us",
+        db: Optional[AsyncSession] = None,
     ) -> JobSuggestionsResponse:
         """
         Generate job suggestions using LLM-generated search query.
         
-        Flow: LLM generates search query from profile → call Adzuna API
+        Flow: LLM generates search query from profile → local job index
+        (if it already holds enough matches) → otherwise call Adzuna API
+
+        Suggestions are background traffic: when the Adzuna budget is low
+        (or exhausted) the last good result for this profile is served instead.
         """
         logger = logging.getLogger(__name__)
+
+        cache_key = (str(profile_id), country, limit)
+        cached = self.suggestions_cache.get(cache_key)
+        if cached is not None and self.client.budget.is_low():
+            logger.info(f"Adzuna budget low, serving cached job suggestions for profile {profile_id}")
+            return cached
         
         # Generate search query using LLM (similar to grants)
         # For jobs, we want keywords like "software engineer", "data scientist", etc.
@@ -67,8 +136,19 @@ class JobsService:
             what=query,
         )
         
-        # Call Adzuna API
-        api_result = await self.client.search(search_request)
+        # Serve from the local index when it has enough matching postings,
+        # otherwise call Adzuna (non-interactive: may not use the reserved quota)
+        local = await self._search_local(db, query, country, limit) if db is not None else []
+        try:
+            if len(local) >= limit:
+                api_result = JobsAPISearchResponse(count=len(local), results=local)
+            else:
+                api_result = await self._search_indexed(search_request, db, interactive=False)
+        except JobsQuotaExceededError:
+            if cached is not None:
+                logger.info(f"Adzuna budget exhausted, serving cached job suggestions for profile {profile_id}")
+                return cached
+            raise
         
         # Map API response to suggestions
         items = [
@@ -87,40 +167,73 @@ class JobsService:
             for job in api_result.results
         ]
         
-        return JobSuggestionsResponse(
+        response = JobSuggestionsResponse(
             profile_id=str(profile_id),
             query_keywords=query.split()[:6],
             total_records=api_result.count or len(items),
             items=items,
         )
+        self.suggestions_cache.set(cache_key, response)
+        return response
+
+    async def _search_local(self, db: AsyncSession, text: str, country: str, limit: int) -> List[JobResult]:
+        try:
+            return await job_index.search_local(db, text, country, limit)
+        except SQLAlchemyError as e:
+            logger.warning(f"Local job index search failed: {e}")
+            await db.rollback()
+            return []
+
+    async def _search_indexed(
+        self,
+        request: JobsSearchRequest,
+        db: Optional[AsyncSession] = None,
+        interactive: bool = True,
+    ) -> JobsAPISearchResponse:
+        """
+        Answer a search from the local job index when its slice is fresh,
+        otherwise query Adzuna and store the results. Index errors are
+        logged and never fail the search.
+        """
+        if db is None:
+            return await self.client.search(request, interactive=interactive)
+
+        key = job_index.slice_key(self.client.search_key(request))
+        try:
+            local = await job_index.get_fresh_slice(db, key)
+        except SQLAlchemyError as e:
+            logger.warning(f"Local job index lookup failed: {e}")
+            await db.rollback()
+            local = None
+        if local is not None:
+            return local
+
+        # End the lookup's transaction so the session does not hold a pooled
+        # connection idle in transaction across the upstream round trip
+        await db.commit()
+        result = await self.client.search(request, interactive=interactive)
+        try:
+            await job_index.store(db, key, request.country or "us", result)
+        except SQLAlchemyError as e:
+            logger.warning(f"Storing jobs in local index failed: {e}")
+            await db.rollback()
+        return result
 
     async def search_jobs(
         self,
         request: JobsSearchRequest,
+        db: Optional[AsyncSession] = None,
     ) -> JobsSearchResponse:
         """
         Used by /jobs/search: user-driven search with explicit parameters.
         """
-        api_result = await self.client.search(request)
-        
-        items = [
-            JobsSearchItem(
-                id=job.id,
-                title=job.title,
-                company=job.company.display_name if job.company else None,
-                location=job.location.display_name if job.location else None,
-                salary_min=job.salary_min,
-                salary_max=job.salary_max,
-                description=job.description,
-                redirect_url=job.redirect_url,
-                created=job.created,
-                category=job.category.label if job.category else None,
-                contract_time=job.contract_time,
-                contract_type=job.contract_type,
-            )
-            for job in api_result.results
-        ]
-        
+        if request.countries or request.locations:
+            return await self._search_jobs_fan_out(request, db)
+
+        api_result = await self._search_indexed(request, db)
+
+        items = [_to_search_item(job, request.country) for job in api_result.results]
+
         return JobsSearchResponse(
             total_records=api_result.count or len(items),
             page=request.page or 1,
@@ -128,6 +241,121 @@ class JobsService:
             items=items,
         )
 
+    async def _search_jobs_fan_out(
+        self,
+        request: JobsSearchRequest,
+        db: Optional[AsyncSession] = None,
+    ) -> JobsSearchResponse:
+        """
+        Search every (country, location) combination concurrently, then merge,
+        dedupe and rank into one list and return the requested page of it.
+
+        Each combination is fetched deep enough to cover `page * results_per_page`
+        results (at most MAX_FAN_OUT_DEPTH, enforced by JobsSearchRequest), so
+        the global page is correct regardless of how results distribute across
+        sources. A failing source is logged and skipped unless every source
+        fails.
+        """
+        page = request.page or 1
+        per_page = request.results_per_page or 10
+        needed = page * per_page
+        upstream_per_page = min(needed, ADZUNA_MAX_PAGE_SIZE)
+        upstream_pages = math.ceil(needed / upstream_per_page)
+
+        combos = [
+            (country, where)
+            for country in (request.countries or [request.country or "us"])
+            for where in (request.locations or [request.where])
+        ]
+        sub_requests = [
+            (combo_idx, request.model_copy(update={
+                "country": country,
+                "where": where,
+                "countries": None,
+                "locations": None,
+                "page": upstream_page,
+                "results_per_page": upstream_per_page,
+            }))
+            for combo_idx, (country, where) in enumerate(combos)
+            for upstream_page in range(1, upstream_pages + 1)
+        ]
+
+        async def search_one(sub: JobsSearchRequest) -> JobsAPISearchResponse:
+            if db is None:
+                return await self._search_indexed(sub)
+            # An AsyncSession cannot be shared by concurrent tasks
+            async with AsyncSessionLocal() as sub_db:
+                return await self._search_indexed(sub, sub_db)
+
+        results = await asyncio.gather(
+            *(search_one(sub) for _, sub in sub_requests),
+            return_exceptions=True,
+        )
+
+        ranked = []  # (rank within source, source index, JobsSearchItem)
+        total_records = 0
+        errors = []
+        for (combo_idx, sub), result in zip(sub_requests, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Jobs fan-out search failed for {sub.country}/{sub.where}: {result}")
+                errors.append(result)
+                continue
+            if sub.page == 1:
+                total_records += result.count or 0
+            offset = (sub.page - 1) * upstream_per_page
+            for idx, job in enumerate(result.results):
+                ranked.append((offset + idx, combo_idx, _to_search_item(job, sub.country)))
+
+        if errors and not ranked:
+            raise errors[0]
+
+        # Relevance: interleave sources by their own rank; date/salary: sort globally
+        descending = (request.sort_dir or "desc").lower() != "asc"
+        if request.sort_by == "date":
+            ranked.sort(key=lambda r: r[2].created or "", reverse=descending)
+        elif request.sort_by == "salary":
+            ranked.sort(
+                key=lambda r: max(r[2].salary_max or 0, r[2].salary_min or 0),
+                reverse=descending,
+            )
+        else:
+            ranked.sort(key=lambda r: (r[0], r[1]))
+
+        merged: List[JobsSearchItem] = []
+        seen_ids = set()
+        seen_keys = set()
+        for _, _, item in ranked:
+            key = _fuzzy_job_key(item.title, item.company)
+            if item.id in seen_ids or (key is not None and key in seen_keys):
+                continue
+            seen_ids.add(item.id)
+            if key is not None:
+                seen_keys.add(key)
+            merged.append(item)
+
+        duplicates = len(ranked) - len(merged)
+        start = (page - 1) * per_page
+        return JobsSearchResponse(
+            total_records=max(total_records - duplicates, len(merged)),
+            page=page,
+            results_per_page=per_page,
+            items=merged[start:start + per_page],
+        )
+
+
+    async def similar_jobs(self, db: AsyncSession, job_id: str, limit: int = 10) -> Optional[JobsSearchResponse]:
+        """Similar jobs ("more like this") from the local index; None if the job was never indexed."""
+        results = await job_index.more_like_this(db, job_id, limit)
+        if results is None:
+            return None
+        items = [_to_search_item(job) for job in results]
+        return JobsSearchResponse(
+            total_records=len(items),
+            page=1,
+            results_per_page=limit,
+            items=items,
+        )
+
 
 # Global service instance
 jobs_service = JobsService()
@@ -0,0 +1,160 @@
+# services/search_service.py
+import asyncio
+import logging
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from schemas.grants import GrantsSearchRequest, GrantsSearchResponse, PaginationReq, SortOption
+from schemas.jobs import JobsSearchRequest, JobsSearchResponse
+from schemas.search import UnifiedSearchRequest, UnifiedSearchItem, UnifiedSearchMerged
+from services.grants_client import GrantsUpstreamError
+from services.grants_service import grants_service
+from services.jobs_client import JobsUpstreamError
+from services.jobs_service import jobs_service
+
+logger = logging.getLogger(__name__)
+
+SIMPLER_GRANTS_OPPORTUNITY_URL = "https://simpler.grants.gov/opportunity/{opportunity_id}"
+
+
+def _dedupe_key(item: UnifiedSearchItem) -> Tuple[str, str]:
+    def norm(value: Optional[str]) -> str:
+        return " ".join(re.sub(r"[^a-z0-9 ]+", " ", (value or "").lower()).split())
+
+    return norm(item.title), norm(item.organization)
+
+
+class SearchService:
+    """Cross-source search over grants and jobs."""
+
+    def __init__(self):
+        self.grants = grants_service
+        self.jobs = jobs_service
+
+    @staticmethod
+    def _grant_items(result: GrantsSearchResponse) -> List[UnifiedSearchItem]:
+        return [
+            UnifiedSearchItem(
+                source="grant",
+                id=grant.opportunity_id,
+                title=grant.title,
+                organization=grant.agency_name,
+                posted=grant.post_date,
+                deadline=grant.close_date,
+                url=SIMPLER_GRANTS_OPPORTUNITY_URL.format(opportunity_id=grant.opportunity_id),
+                rank=rank,
+            )
+            for rank, grant in enumerate(result.items)
+        ]
+
+    @staticmethod
+    def _job_items(result: JobsSearchResponse) -> List[UnifiedSearchItem]:
+        return [
+            UnifiedSearchItem(
+                source="job",
+                id=job.id,
+                title=job.title,
+                organization=job.company,
+                location=job.location,
+                posted=job.created,
+                url=job.redirect_url,
+                rank=rank,
+            )
+            for rank, job in enumerate(result.items)
+        ]
+
+    @staticmethod
+    def _error_event(source: str, error: BaseException) -> Dict[str, Any]:
+        status_code = None
+        if isinstance(error, (GrantsUpstreamError, JobsUpstreamError)):
+            status_code = error.status_code
+        return {
+            "event": "error",
+            "source": source,
+            "status_code": status_code,
+            "detail": str(error),
+        }
+
+    async def stream_unified(
+        self,
+        request: UnifiedSearchRequest,
+        db: Optional[AsyncSession] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the grants and jobs searches concurrently and yield events:
+
+        - {"event": "grants" | "jobs", "data": <source response>} as each source finishes
+        - {"event": "error", "source": ..., "detail": ...} if a source fails
+        - {"event": "merged", "sources": [...], "items": [...]} last, both sources
+          interleaved by their own rank and deduped by title + organization
+
+        A slow source never delays the other's event. If the consumer goes
+        away, searches still in flight are cancelled.
+        """
+        grants_request = GrantsSearchRequest(
+            query=request.query,
+            filters=request.grants_filters,
+            pagination=PaginationReq(
+                page_offset=1,
+                page_size=request.limit,
+                sort_order=[SortOption(order_by="relevancy", sort_direction="descending")],
+            ),
+        )
+        jobs_request = JobsSearchRequest(
+            what=request.query,
+            where=request.where,
+            country=request.country,
+            page=1,
+            results_per_page=request.limit,
+        )
+
+        tasks = {
+            asyncio.ensure_future(self.grants.search_grants(grants_request)): "grants",
+            asyncio.ensure_future(self.jobs.search_jobs(jobs_request, db=db)): "jobs",
+        }
+        items_by_source: Dict[str, List[UnifiedSearchItem]] = {}
+
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    source = tasks[task]
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        logger.warning(f"Unified search: {source} failed: {e}")
+                        yield self._error_event(source, e)
+                        continue
+
+                    items_by_source[source] = (
+                        self._grant_items(result) if source == "grants" else self._job_items(result)
+                    )
+                    yield {"event": source, "data": result.model_dump(mode="json")}
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        ranked = sorted(
+            (item for items in items_by_source.values() for item in items),
+            key=lambda item: (item.rank, item.source),
+        )
+        merged: List[UnifiedSearchItem] = []
+        seen = set()
+        for item in ranked:
+            key = _dedupe_key(item)
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(item)
+
+        yield UnifiedSearchMerged(
+            sources=sorted(items_by_source),
+            items=merged,
+        ).model_dump(mode="json")
+
+
+# Global service instance
+search_service = SearchService()
@@ -0,0 +1,293 @@
+# services/storage_gc.py
+"""
+Garbage collection and accounting for uploaded files.
+
+Uploads are content-addressed and may be shared by several documents, so a
+file can only go once no `documents.file_path` references it. The collector
+walks UPLOAD_DIR in batches, checks each batch against the documents table,
+and removes unreferenced files older than STORAGE_GC_GRACE_PERIOD (the grace
+period covers uploads whose row is not committed yet; an upload that
+dedupes onto an existing file refreshes its mtime). Abandoned temp files
+from interrupted uploads are reclaimed the same way.
+
+The same pass prunes the OCR page cache: entries unused for
+OCR_CACHE_MAX_AGE go, then the least recently used ones until the cache
+fits in OCR_CACHE_MAX_BYTES.
+"""
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from config import get_settings
+from database import SessionLocal
+from models.document import Document
+from utils.file_utils import upload_tmp_dir
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def _walk_files(root: str) -> Iterator[os.DirEntry]:
+    """Yield every regular file below `root` without building a full listing."""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+        except FileNotFoundError:
+            continue
+
+
+def _discard(file_path: str, grace_cutoff: float) -> bool:
+    """
+    Remove a stored file unless it was touched after `grace_cutoff`.
+
+    The file is moved aside before its mtime is checked, so a concurrent
+    upload of the same content either refreshed the mtime first (and the
+    file is put back) or finds it gone and publishes its own copy.
+
+    Returns:
+        True if the file was removed
+    """
+    trash_path = os.path.join(upload_tmp_dir(), f"{uuid.uuid4().hex}.deleted")
+    try:
+        os.replace(file_path, trash_path)
+    except FileNotFoundError:
+        return False
+    if os.stat(trash_path).st_mtime > grace_cutoff:
+        os.replace(trash_path, file_path)
+        return False
+    try:
+        os.remove(trash_path)
+    except FileNotFoundError:  # already swept as an abandoned temp file
+        pass
+    return True
+
+
+def remove_if_unreferenced(db: Session, file_path: str) -> bool:
+    """
+    Delete a stored file if no document points at it any more.
+
+    Files touched within STORAGE_GC_GRACE_PERIOD may back an upload whose
+    document is not committed yet; those are left to the collector.
+
+    Returns:
+        True if the file was removed
+    """
+    still_used = db.query(Document.id).filter(Document.file_path == file_path).first()
+    if still_used:
+        return False
+    return _discard(file_path, time.time() - settings.STORAGE_GC_GRACE_PERIOD)
+
+
+class StorageGC:
+    """Reconciles UPLOAD_DIR against the documents table."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    def _referenced(self, db: Session, paths: List[str]) -> set:
+        """Subset of `paths` referenced by a document (matched as stored or normalized)."""
+        candidates = {}
+        for path in paths:
+            candidates[path] = path
+            candidates[os.path.normpath(path)] = path
+            candidates[os.path.abspath(path)] = path
+        rows = db.query(Document.file_path).filter(Document.file_path.in_(list(candidates))).all()
+        return {candidates[file_path] for (file_path,) in rows}
+
+    def collect(self, db: Session, dry_run: bool = False) -> Dict[str, int]:
+        """
+        One reconcile pass.
+
+        Returns:
+            Counts: files scanned, orphans removed, bytes reclaimed, bytes kept
+        """
+        grace_cutoff = time.time() - settings.STORAGE_GC_GRACE_PERIOD
+        tmp_dir = os.path.normpath(upload_tmp_dir())
+        stats = {"scanned": 0, "removed": 0, "reclaimed_bytes": 0, "stored_bytes": 0}
+
+        def reclaim(entry: os.DirEntry, size: int) -> None:
+            if not dry_run:
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    return
+            stats["removed"] += 1
+            stats["reclaimed_bytes"] += size
+
+        batch: List[os.DirEntry] = []
+
+        def flush() -> None:
+            referenced = self._referenced(db, [entry.path for entry in batch])
+            for entry in batch:
+                stat = entry.stat(follow_symlinks=False)
+                if entry.path in referenced or stat.st_mtime > grace_cutoff:
+                    stats["stored_bytes"] += stat.st_size
+                elif dry_run or _discard(entry.path, grace_cutoff):
+                    stats["removed"] += 1
+                    stats["reclaimed_bytes"] += stat.st_size
+                else:
+                    stats["stored_bytes"] += stat.st_size
+            batch.clear()
+
+        for entry in _walk_files(settings.UPLOAD_DIR):
+            if entry.name == ".gitkeep":
+                continue
+            stats["scanned"] += 1
+            if os.path.dirname(os.path.normpath(entry.path)) == tmp_dir:
+                # Interrupted uploads never become documents
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_mtime <= grace_cutoff:
+                    reclaim(entry, stat.st_size)
+                continue
+            batch.append(entry)
+            if len(batch) >= settings.STORAGE_GC_BATCH_SIZE:
+                flush()
+        if batch:
+            flush()
+
+        logger.info(
+            f"Storage GC{' (dry run)' if dry_run else ''}: scanned {stats['scanned']} files, "
+            f"removed {stats['removed']} orphans ({stats['reclaimed_bytes']} bytes), "
+            f"{stats['stored_bytes']} bytes in use"
+        )
+        return stats
+
+    def prune_ocr_cache(self) -> Dict[str, int]:
+        """
+        Trim OCR_CACHE_DIR by age, then by size (oldest first).
+
+        Returns:
+            Counts: entries removed, bytes reclaimed, bytes kept
+        """
+        age_cutoff = time.time() - settings.OCR_CACHE_MAX_AGE if settings.OCR_CACHE_MAX_AGE > 0 else None
+        stats = {"removed": 0, "reclaimed_bytes": 0, "stored_bytes": 0}
+        entries = []
+
+        def reclaim(path: str, size: int) -> None:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                return
+            stats["removed"] += 1
+            stats["reclaimed_bytes"] += size
+
+        for entry in _walk_files(settings.OCR_CACHE_DIR):
+            stat = entry.stat(follow_symlinks=False)
+            if age_cutoff is not None and stat.st_mtime <= age_cutoff:
+                reclaim(entry.path, stat.st_size)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        stored = sum(size for _, size, _ in entries)
+        if settings.OCR_CACHE_MAX_BYTES > 0 and stored > settings.OCR_CACHE_MAX_BYTES:
+            entries.sort()
+            for _, size, path in entries:
+                if stored <= settings.OCR_CACHE_MAX_BYTES:
+                    break
+                reclaim(path, size)
+                stored -= size
+        stats["stored_bytes"] = stored
+
+        if stats["removed"]:
+            logger.info(
+                f"OCR cache: removed {stats['removed']} entries ({stats['reclaimed_bytes']} bytes), "
+                f"{stats['stored_bytes']} bytes kept"
+            )
+        return stats
+
+    def missing_files(self, db: Session) -> List[int]:
+        """Ids of documents whose file is gone from disk (reported, never deleted)."""
+        missing = []
+        last_id = 0
+        while True:
+            rows = (
+                db.query(Document.id, Document.file_path)
+                .filter(Document.id > last_id)
+                .order_by(Document.id)
+                .limit(settings.STORAGE_GC_BATCH_SIZE)
+                .all()
+            )
+            if not rows:
+                return missing
+            missing.extend(doc_id for doc_id, file_path in rows if not os.path.isfile(file_path))
+            last_id = rows[-1][0]
+
+    def usage_by_user(self, db: Session, user_id: Optional[int] = None) -> List[Dict[str, int]]:
+        """
+        Storage used per user: document count and bytes uploaded.
+
+        Bytes count every document once even when its content is shared
+        with another upload; that is what the user is "holding".
+        """
+        query = db.query(
+            Document.user_id,
+            func.count(Document.id),
+            func.coalesce(func.sum(Document.file_size), 0),
+            func.count(func.distinct(Document.content_hash)),
+        ).group_by(Document.user_id)
+        if user_id is not None:
+            query = query.filter(Document.user_id == user_id)
+        return [
+            {
+                "user_id": uid,
+                "documents": documents,
+                "bytes": int(total_bytes),
+                "unique_files": unique_files,
+            }
+            for uid, documents, total_bytes, unique_files in query.order_by(Document.user_id).all()
+        ]
+
+    def _run_once(self) -> None:
+        db = SessionLocal()
+        try:
+            self.collect(db)
+            self.prune_ocr_cache()
+            missing = self.missing_files(db)
+            if missing:
+                logger.warning(f"Storage GC: {len(missing)} documents reference missing files: {missing[:20]}")
+            usage = self.usage_by_user(db)
+            top = sorted(usage, key=lambda u: u["bytes"], reverse=True)[:10]
+            logger.info(
+                f"Storage usage: {len(usage)} users, {sum(u['bytes'] for u in usage)} bytes; "
+                f"largest: {[(u['user_id'], u['bytes']) for u in top]}"
+            )
+        finally:
+            db.close()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await run_in_threadpool(self._run_once)
+            except Exception as e:
+                logger.error(f"Storage GC pass failed: {e}", exc_info=True)
+            await asyncio.sleep(settings.STORAGE_GC_INTERVAL)
+
+    def start(self) -> None:
+        if self._task is None and settings.STORAGE_GC_INTERVAL > 0:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global collector instance
+storage_gc = StorageGC()
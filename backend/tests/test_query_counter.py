@@ -0,0 +1,68 @@
+"""
+The per-request N+1 detector in main.sql_instrumentation.
+
+A throwaway route runs one query per "row" against an instrumented
+in-memory SQLite engine, the classic N+1 shape.
+"""
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+import main
+from utils import query_counter
+
+engine = create_engine("sqlite://")
+query_counter.install(engine)
+
+N_PLUS_ONE_PATH = "/_test/n-plus-one"
+
+
+@main.app.get(N_PLUS_ONE_PATH)
+def n_plus_one():
+    with engine.connect() as conn:
+        ids = [row[0] for row in conn.execute(text("SELECT value FROM json_each('[1,2,3,4,5]')"))]
+        for _ in range(5):
+            for row_id in ids:
+                conn.execute(text("SELECT :id"), {"id": row_id})
+    return {"ok": True}
+
+
+@pytest.fixture
+def detector(monkeypatch):
+    """Enable the detector with a threshold the route exceeds (26 queries)."""
+    monkeypatch.setattr(main.settings, "DEBUG", True)
+    monkeypatch.setattr(main.settings, "QUERY_COUNT_THRESHOLD", 20)
+    return monkeypatch
+
+
+def test_strict_mode_fails_an_n_plus_one_request(detector):
+    detector.setattr(main.settings, "QUERY_COUNT_STRICT", True)
+    client = TestClient(main.app)
+
+    with pytest.raises(query_counter.TooManyQueries, match="issued 26 queries"):
+        client.get(N_PLUS_ONE_PATH)
+
+
+def test_non_strict_mode_only_warns(detector, caplog):
+    detector.setattr(main.settings, "QUERY_COUNT_STRICT", False)
+    client = TestClient(main.app)
+
+    with caplog.at_level(logging.WARNING, logger="main"):
+        response = client.get(N_PLUS_ONE_PATH)
+
+    assert response.status_code == 200
+    assert any("issued 26 queries" in record.getMessage() for record in caplog.records)
+
+
+def test_under_threshold_is_silent(detector, caplog):
+    detector.setattr(main.settings, "QUERY_COUNT_STRICT", True)
+    detector.setattr(main.settings, "QUERY_COUNT_THRESHOLD", 100)
+    client = TestClient(main.app)
+
+    with caplog.at_level(logging.WARNING, logger="main"):
+        response = client.get(N_PLUS_ONE_PATH)
+
+    assert response.status_code == 200
+    assert not [r for r in caplog.records if "issued" in r.getMessage()]
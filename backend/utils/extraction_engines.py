@@ -0,0 +1,312 @@
+"""
+Text extraction engine registry.
+
+Each engine turns one file type into plain text. PDF engines accept an
+optional page range so the extraction pool can split large documents.
+Engines whose library is not installed are simply not registered.
+
+Engine choice is per file type via PDF_EXTRACTION_ENGINE /
+DOCX_EXTRACTION_ENGINE, or "auto": PDFs are probed by extracting the first
+pages with each engine in PDF_ENGINE_PREFERENCE order (fastest first, per
+benchmarks/extraction_engines.py) and the first engine whose output looks
+like real text wins. The engine that ran is recorded as
+DocumentText.extraction_method.
+"""
+import re
+import string
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from xml.etree.ElementTree import iterparse
+
+from config import get_settings
+from utils.file_utils import count_pdf_pages, extract_text_from_docx, extract_text_from_pdf
+
+settings = get_settings()
+
+try:
+    import pypdfium2
+except ImportError:  # optional engine
+    pypdfium2 = None
+
+try:
+    from pdfminer.high_level import extract_text as pdfminer_extract_text
+except ImportError:  # optional engine
+    pdfminer_extract_text = None
+
+
+# Fastest first; see benchmarks/extraction_engines.py
+PDF_ENGINE_PREFERENCE = ("pypdfium2", "pypdf2", "pdfminer")
+DOCX_ENGINE_PREFERENCE = ("docx-stream", "python-docx")
+
+PROBE_PAGES = 2
+PROBE_MIN_QUALITY = 0.8
+
+_WORD_RE = re.compile(r"[^\W_]+(?:[-'.,/][^\W_]+)*")
+
+
+@dataclass(frozen=True)
+class ExtractionEngine:
+    """A named text extractor for a set of file extensions."""
+    name: str
+    extensions: Tuple[str, ...]
+    extract: Callable[..., str]  # (file_path, start=0, stop=None) -> text
+
+
+ENGINES: Dict[str, ExtractionEngine] = {}
+
+
+def register_engine(name: str, extensions: Tuple[str, ...]):
+    """Decorator: register `func(file_path, start=0, stop=None)` as an engine."""
+    def decorator(func: Callable[..., str]) -> Callable[..., str]:
+        ENGINES[name] = ExtractionEngine(name=name, extensions=extensions, extract=func)
+        return func
+    return decorator
+
+
+def engines_for(file_ext: str) -> List[ExtractionEngine]:
+    """Registered engines for an extension, in preference order."""
+    preference = PDF_ENGINE_PREFERENCE if file_ext == ".pdf" else DOCX_ENGINE_PREFERENCE
+    engines = [ENGINES[name] for name in preference if name in ENGINES]
+    engines += [e for e in ENGINES.values() if file_ext in e.extensions and e not in engines]
+    return [e for e in engines if file_ext in e.extensions]
+
+
+def text_quality(text: str) -> float:
+    """
+    Share of whitespace-separated tokens that look like words or numbers.
+
+    Mis-decoded fonts show up as `(cid:12)` tokens, replacement characters
+    or glyph soup, and missing word spacing as very long tokens; all of
+    these lower the score. Returns 0.0 for empty text.
+    """
+    tokens = text.split()
+    if not tokens:
+        return 0.0
+    wordlike = 0
+    for token in tokens:
+        token = token.strip(string.punctuation + "•·–—“”‘’")
+        if not token or (len(token) <= 25 and _WORD_RE.fullmatch(token)):
+            wordlike += 1
+    return wordlike / len(tokens)
+
+
+# ---------- Engines ----------
+
+@register_engine("pypdf2", (".pdf",))
+def _extract_pypdf2(file_path: str, start: int = 0, stop: Optional[int] = None) -> str:
+    return extract_text_from_pdf(file_path, start, stop)
+
+
+if pypdfium2 is not None:
+    @register_engine("pypdfium2", (".pdf",))
+    def _extract_pypdfium2(file_path: str, start: int = 0, stop: Optional[int] = None) -> str:
+        try:
+            text_parts = []
+            pdf = pypdfium2.PdfDocument(file_path)
+            try:
+                if stop is None:
+                    stop = len(pdf)
+                for page_number in range(start, stop):
+                    page = pdf[page_number]
+                    textpage = page.get_textpage()
+                    text = textpage.get_text_range().replace("\r\n", "\n")
+                    textpage.close()
+                    page.close()
+                    if text.strip():
+                        text_parts.append(text)
+            finally:
+                pdf.close()
+
+            return "\n".join(text_parts)
+
+        except Exception as e:
+            raise Exception(f"Failed to extract text from PDF: {str(e)}")
+
+
+if pdfminer_extract_text is not None:
+    @register_engine("pdfminer", (".pdf",))
+    def _extract_pdfminer(file_path: str, start: int = 0, stop: Optional[int] = None) -> str:
+        try:
+            page_numbers = None
+            if start or stop is not None:
+                page_numbers = range(start, stop if stop is not None else count_pdf_pages(file_path))
+            text = pdfminer_extract_text(file_path, page_numbers=page_numbers)
+            # pdfminer separates pages with form feeds
+            return "\n".join(page for page in text.split("\f") if page.strip())
+
+        except Exception as e:
+            raise Exception(f"Failed to extract text from PDF: {str(e)}")
+
+
+@register_engine("python-docx", (".docx", ".doc"))
+def _extract_python_docx(file_path: str, start: int = 0, stop: Optional[int] = None) -> str:
+    return extract_text_from_docx(file_path)
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+
+@register_engine("docx-stream", (".docx",))
+def _extract_docx_stream(file_path: str, start: int = 0, stop: Optional[int] = None) -> str:
+    """
+    Stream word/document.xml out of the zip with iterparse, without building
+    python-docx's object model.
+
+    Paragraphs and tables come out in reading order. Each table row becomes
+    one line with its non-empty cells joined by " | " (resumes often lay out
+    whole sections as tables); nested tables are flattened into their cell.
+    Finished body elements are discarded as parsing goes, so memory stays
+    flat regardless of document length.
+    """
+    try:
+        text_parts: List[str] = []
+        current: List[str] = []  # runs of the paragraph being read
+        tables: List[dict] = []  # open tables, innermost last
+        body = None
+        depth = 0
+        skip_depth = 0  # inside mc:Fallback (duplicate of mc:Choice content)
+        props_depth = 0  # inside w:pPr, where w:tab is a tab stop, not a character
+
+        with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as xml:
+            for event, elem in iterparse(xml, events=("start", "end")):
+                tag = elem.tag
+                if event == "start":
+                    depth += 1
+                    if tag == _MC_FALLBACK:
+                        skip_depth += 1
+                    elif tag == f"{_W}pPr":
+                        props_depth += 1
+                    elif tag == f"{_W}body":
+                        body = elem
+                    elif skip_depth:
+                        pass
+                    elif tag == f"{_W}tbl":
+                        tables.append({"rows": [], "row": [], "cell": []})
+                    elif tag == f"{_W}tr" and tables:
+                        tables[-1]["row"] = []
+                    elif tag == f"{_W}tc" and tables:
+                        tables[-1]["cell"] = []
+                    continue
+
+                depth -= 1
+                if tag == _MC_FALLBACK:
+                    skip_depth -= 1
+                elif tag == f"{_W}pPr":
+                    props_depth -= 1
+                elif skip_depth:
+                    pass
+                elif tag == f"{_W}t":
+                    current.append(elem.text or "")
+                elif tag == f"{_W}tab" and not props_depth:
+                    current.append("\t")
+                elif tag in (f"{_W}br", f"{_W}cr"):
+                    current.append("\n")
+                elif tag == f"{_W}p":
+                    text = "".join(current).strip()
+                    current = []
+                    if text:
+                        (tables[-1]["cell"] if tables else text_parts).append(text)
+                elif tag == f"{_W}tc" and tables:
+                    cell = " ".join(tables[-1]["cell"])
+                    if cell:
+                        tables[-1]["row"].append(cell)
+                elif tag == f"{_W}tr" and tables:
+                    if tables[-1]["row"]:
+                        tables[-1]["rows"].append(" | ".join(tables[-1]["row"]))
+                elif tag == f"{_W}tbl" and tables:
+                    rows = tables.pop()["rows"]
+                    if tables:
+                        tables[-1]["cell"].append("; ".join(rows))
+                    else:
+                        text_parts.extend(rows)
+
+                # Drop each top-level body element once it has been read
+                if depth == 2 and body is not None:
+                    body.clear()
+
+        return "\n".join(part for part in text_parts if part)
+
+    except Exception as e:
+        raise Exception(f"Failed to extract text from DOCX: {str(e)}")
+
+
+# ---------- Selection ----------
+
+def _probe_pdf(file_path: str, engines: List[ExtractionEngine]) -> ExtractionEngine:
+    """First engine whose output on the first pages looks like text, else the best one."""
+    stop = min(PROBE_PAGES, count_pdf_pages(file_path))
+    best, best_quality = engines[0], -1.0
+    for engine in engines:
+        try:
+            quality = text_quality(engine.extract(file_path, 0, stop))
+        except Exception:
+            continue
+        if quality >= PROBE_MIN_QUALITY:
+            return engine
+        if quality > best_quality:
+            best, best_quality = engine, quality
+    return best
+
+
+def select_engine(file_path: str) -> ExtractionEngine:
+    """
+    Pick the extraction engine for a file.
+
+    Raises:
+        ValueError: If no engine handles the file type
+    """
+    file_ext = Path(file_path).suffix.lower()
+    engines = engines_for(file_ext)
+    if not engines:
+        raise ValueError(f"Unsupported file type: {file_ext}")
+
+    configured = settings.PDF_EXTRACTION_ENGINE if file_ext == ".pdf" else settings.DOCX_EXTRACTION_ENGINE
+    if configured != "auto":
+        engine = ENGINES.get(configured)
+        if engine is not None and file_ext in engine.extensions:
+            return engine
+
+    if file_ext == ".pdf":
+        return _probe_pdf(file_path, engines)
+    if file_ext == ".docx" and "docx-stream" in ENGINES and zipfile.is_zipfile(file_path):
+        return ENGINES["docx-stream"]
+    return ENGINES.get("python-docx", engines[0])
+
+
+def probe_file(file_path: str) -> Tuple[str, int]:
+    """
+    Select the engine for a file and count its pages (0 for non-PDFs).
+
+    Returns:
+        Tuple of (engine_name, page_count)
+    """
+    engine = select_engine(file_path)
+    page_count = count_pdf_pages(file_path) if ".pdf" in engine.extensions else 0
+    return engine.name, page_count
+
+
+def extract_with_engine(
+    engine_name: str,
+    file_path: str,
+    start: int = 0,
+    stop: Optional[int] = None,
+) -> str:
+    """Extract text (optionally a PDF page range) with a named engine."""
+    return ENGINES[engine_name].extract(file_path, start, stop)
+
+
+def extract_text_from_file(file_path: str) -> Tuple[str, str]:
+    """
+    Extract text from a file (PDF or DOCX).
+
+    Args:
+        file_path: Path to file
+
+    Returns:
+        Tuple of (extracted_text, engine_name)
+    """
+    engine = select_engine(file_path)
+    return engine.extract(file_path), engine.name
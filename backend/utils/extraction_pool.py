@@ -0,0 +1,312 @@
+"""
+Process pool for CPU-bound document text extraction.
+
+PyPDF2 / python-docx parsing is pure Python and would block the event loop
+(and, through the GIL, every other request on the worker) for the whole
+extraction. Jobs run in a ProcessPoolExecutor instead, with:
+
+- a per-job timeout, enforced inside the worker with SIGALRM so a stuck
+  job fails without killing the process (the pool is recycled only if a
+  worker stops responding entirely)
+- an address-space rlimit per worker so pathological PDFs raise
+  MemoryError instead of exhausting the host
+- backpressure: once EXTRACTION_MAX_PENDING jobs are queued or running,
+  new jobs are rejected with ExtractionPoolBusy
+
+PDFs with at least PDF_PARALLEL_MIN_PAGES pages are split into page ranges
+that run on several workers at once and are reassembled in page order.
+Each range re-parses the PDF's cross-reference table, which is what makes
+splitting a loss for short documents; see benchmarks/pdf_extraction.py
+for how the cutoff was chosen.
+
+PDFs that yield less than OCR_MIN_CHARS_PER_PAGE characters per page
+(typically scans) get a Tesseract pass over their first OCR_MAX_PAGES pages,
+one page per job, with at most OCR_MAX_CONCURRENT_PAGES pages in the pool at
+once so OCR cannot starve ordinary extractions. Page jobs in the pool count
+towards EXTRACTION_MAX_PENDING, and the whole pass is abandoned (remaining
+pages cancelled) on the first failed page or once OCR_TIMEOUT expires.
+"""
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Optional, Tuple
+
+from config import get_settings
+from utils.extraction_engines import extract_with_engine, probe_file
+from utils.ocr import OCR_METHOD, OCRUnavailable, ocr_pdf_page
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class ExtractionError(Exception):
+    """Base exception for extraction pool errors."""
+
+
+class ExtractionPoolBusy(ExtractionError):
+    """Too many extraction jobs already queued."""
+
+
+class ExtractionTimeout(ExtractionError):
+    """Extraction did not finish within EXTRACTION_TIMEOUT."""
+
+
+class _DeadlineExceeded(BaseException):
+    """Raised inside a worker when its SIGALRM deadline fires.
+
+    A BaseException so the engines' broad `except Exception` wrappers (and
+    the probe's try-the-next-engine loop) cannot swallow or rewrap it, and
+    not a TimeoutError, which on Python 3.11+ is also asyncio.TimeoutError
+    and must stay distinguishable from the parent's own wait_for deadline.
+    """
+
+
+def _init_worker(memory_limit_mb: int) -> None:
+    """Worker initializer: cap the address space of the worker process."""
+    if memory_limit_mb <= 0:
+        return
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _alarm_handler(signum, frame):
+    raise _DeadlineExceeded("extraction timed out")
+
+
+def _run_with_deadline(timeout: int, func: Callable, *args):
+    """Runs in the worker process: call `func(*args)` under a SIGALRM deadline."""
+    use_alarm = hasattr(signal, "SIGALRM") and timeout > 0
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _alarm_handler)
+        signal.alarm(timeout)
+    try:
+        return func(*args)
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+
+
+class ExtractionPool:
+    """Bounded process pool that runs text extraction off the event loop."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        timeout: int = 60,
+        memory_limit_mb: int = 1024,
+        pdf_parallel_min_pages: int = 0,
+        pdf_min_pages_per_chunk: int = 1,
+        ocr_enabled: bool = False,
+        ocr_min_chars_per_page: int = 20,
+        ocr_max_concurrent_pages: int = 2,
+        ocr_page_timeout: int = 120,
+        ocr_max_pages: int = 0,
+        ocr_timeout: int = 0,
+    ) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 4
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.pdf_parallel_min_pages = pdf_parallel_min_pages
+        self.pdf_min_pages_per_chunk = max(pdf_min_pages_per_chunk, 1)
+        self.ocr_enabled = ocr_enabled
+        self.ocr_min_chars_per_page = ocr_min_chars_per_page
+        self.ocr_page_timeout = ocr_page_timeout
+        self.ocr_max_pages = ocr_max_pages
+        self.ocr_timeout = ocr_timeout
+        self._ocr_slots = asyncio.Semaphore(max(ocr_max_concurrent_pages, 1))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                # spawn: never fork a process that holds an event loop and threads
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.memory_limit_mb,),
+            )
+        return self._executor
+
+    def _recycle(self) -> None:
+        """Drop a pool whose workers are stuck or dead; a new one is created lazily."""
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        for process in list(getattr(executor, "_processes", {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def is_saturated(self) -> bool:
+        return self._pending >= self.max_pending
+
+    def free_capacity(self) -> int:
+        """How many more jobs can be queued before new ones are rejected."""
+        return max(self.max_pending - self._pending, 0)
+
+    async def _submit(self, func: Callable, *args, timeout: Optional[int] = None):
+        """Run one job in the pool, mapping worker failures to ExtractionError."""
+        timeout = timeout or self.timeout
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._get_executor(), _run_with_deadline, timeout, func, *args
+        )
+        try:
+            # Grace period on top of the in-worker alarm, for a worker that
+            # cannot service signals (e.g. stuck inside C code)
+            return await asyncio.wait_for(future, timeout=timeout + 10)
+        except _DeadlineExceeded as e:
+            # The worker interrupted its own job and is free again
+            raise ExtractionTimeout(f"Extraction timed out after {timeout}s") from e
+        except asyncio.TimeoutError:
+            logger.error(f"Extraction worker unresponsive for {args[0]}; recycling pool")
+            self._recycle()
+            raise ExtractionTimeout(f"Extraction timed out after {timeout}s")
+        except MemoryError as e:
+            raise ExtractionError(
+                f"Extraction exceeded the {self.memory_limit_mb}MB memory limit"
+            ) from e
+        except BrokenProcessPool as e:
+            self._recycle()
+            raise ExtractionError(f"Extraction worker crashed: {e}") from e
+        except Exception as e:
+            raise ExtractionError(f"Extraction failed: {e}") from e
+
+    def _page_ranges(self, page_count: int) -> List[Tuple[int, int]]:
+        """Split pages into at most max_workers contiguous ranges."""
+        size = max(math.ceil(page_count / self.max_workers), self.pdf_min_pages_per_chunk)
+        return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+    def _needs_ocr(self, text: str, page_count: int) -> bool:
+        return (
+            self.ocr_enabled
+            and page_count > 0
+            and len(text.strip()) < self.ocr_min_chars_per_page * page_count
+        )
+
+    async def _ocr_page(self, file_path: str, page_number: int) -> str:
+        # Only pages holding an OCR slot are in the pool, so only they count
+        # as pending; pages waiting for a slot must not lock out uploads
+        async with self._ocr_slots:
+            self._pending += 1
+            try:
+                return await self._submit(
+                    ocr_pdf_page, file_path, page_number, timeout=self.ocr_page_timeout
+                )
+            finally:
+                self._pending -= 1
+
+    async def _ocr_pages(self, file_path: str, page_count: int) -> List[str]:
+        """OCR pages concurrently; the first failure or the OCR_TIMEOUT deadline cancels the rest."""
+        tasks = [
+            asyncio.create_task(self._ocr_page(file_path, page_number))
+            for page_number in range(page_count)
+        ]
+        try:
+            done, pending = await asyncio.wait(
+                tasks, timeout=self.ocr_timeout or None, return_when=asyncio.FIRST_EXCEPTION
+            )
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+            if pending:
+                raise ExtractionTimeout(f"OCR did not finish within {self.ocr_timeout}s")
+            return [task.result() for task in tasks]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _ocr(self, file_path: str, page_count: int) -> Optional[str]:
+        """OCR up to ocr_max_pages pages; None if OCR is unavailable or failed."""
+        if 0 < self.ocr_max_pages < page_count:
+            logger.info(f"OCR limited to the first {self.ocr_max_pages} of {page_count} pages of {file_path}")
+            page_count = self.ocr_max_pages
+        try:
+            pages = await self._ocr_pages(file_path, page_count)
+        except ExtractionError as e:
+            if isinstance(e.__cause__, OCRUnavailable):
+                logger.warning(f"Skipping OCR for {file_path}: {e.__cause__}")
+            else:
+                logger.error(f"OCR failed for {file_path}: {e}")
+            return None
+        return "\n".join(page for page in pages if page)
+
+    async def _extract(self, file_path: str) -> Tuple[str, str]:
+        engine, page_count = await self._submit(probe_file, file_path)
+        ranges = self._page_ranges(page_count) if page_count else []
+        if (
+            self.pdf_parallel_min_pages > 0
+            and page_count >= self.pdf_parallel_min_pages
+            and len(ranges) > 1
+        ):
+            chunks = await asyncio.gather(*(
+                self._submit(extract_with_engine, engine, file_path, start, stop)
+                for start, stop in ranges
+            ))
+            # Same output as a serial run: non-empty pages joined by newlines
+            text = "\n".join(chunk for chunk in chunks if chunk)
+        else:
+            text = await self._submit(extract_with_engine, engine, file_path)
+
+        if self._needs_ocr(text, page_count):
+            ocr_text = await self._ocr(file_path, page_count)
+            if ocr_text and len(ocr_text.strip()) > len(text.strip()):
+                return ocr_text, OCR_METHOD
+        return text, engine
+
+    async def extract(self, file_path: str) -> Tuple[str, str]:
+        """
+        Extract text from `file_path` in worker processes.
+
+        Returns:
+            Tuple of (extracted_text, engine_name)
+
+        Raises:
+            ExtractionPoolBusy: the pool already has max_pending jobs
+            ExtractionTimeout: the job exceeded the per-job timeout
+            ExtractionError: the worker ran out of memory, crashed or the
+                file could not be parsed
+        """
+        if self.is_saturated():
+            raise ExtractionPoolBusy(
+                f"Extraction queue is full ({self._pending} jobs pending)"
+            )
+
+        self._pending += 1
+        try:
+            return await self._extract(file_path)
+        finally:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global pool instance
+extraction_pool = ExtractionPool(
+    max_workers=settings.EXTRACTION_WORKERS or None,
+    max_pending=settings.EXTRACTION_MAX_PENDING or None,
+    timeout=settings.EXTRACTION_TIMEOUT,
+    memory_limit_mb=settings.EXTRACTION_MEMORY_LIMIT_MB,
+    pdf_parallel_min_pages=settings.PDF_PARALLEL_MIN_PAGES,
+    pdf_min_pages_per_chunk=settings.PDF_MIN_PAGES_PER_CHUNK,
+    ocr_enabled=settings.OCR_ENABLED,
+    ocr_min_chars_per_page=settings.OCR_MIN_CHARS_PER_PAGE,
+    ocr_max_concurrent_pages=settings.OCR_MAX_CONCURRENT_PAGES,
+    ocr_page_timeout=settings.OCR_PAGE_TIMEOUT,
+    ocr_max_pages=settings.OCR_MAX_PAGES,
+    ocr_timeout=settings.OCR_TIMEOUT,
+)
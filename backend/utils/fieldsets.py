@@ -0,0 +1,77 @@
+"""
+Sparse fieldsets (`?fields=id,title,status`) for list endpoints.
+
+Only the requested columns are selected (everything else is deferred and
+raises if touched), relationships are loaded only when asked for, and the
+items are serialized with a response schema restricted to those fields.
+"""
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple, Type
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import InstrumentedAttribute, load_only, selectinload
+
+from schemas.pagination import Page
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[Tuple[str, ...]]:
+    """
+    Validate a comma-separated `fields` parameter against `schema`.
+
+    Returns:
+        The requested field names (always including "id"), or None when
+        the full representation was asked for
+
+    Raises:
+        HTTPException: If a field is not part of `schema`
+    """
+    if not fields:
+        return None
+
+    requested = dict.fromkeys(["id"] + [f.strip() for f in fields.split(",") if f.strip()])
+    unknown = [f for f in requested if f not in schema.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return tuple(requested)
+
+
+def load_options(model: type, fields: Tuple[str, ...], *required: InstrumentedAttribute) -> List[Any]:
+    """
+    Loader options selecting only `fields` (plus `required` columns, e.g.
+    the pagination sort key) and eager-loading requested relationships.
+    """
+    mapper = inspect(model)
+    columns = [getattr(model, f) for f in fields if f in mapper.column_attrs]
+    options: List[Any] = [load_only(*columns, *required, raiseload=True)]
+    options += [selectinload(getattr(model, f)) for f in fields if f in mapper.relationships]
+    return options
+
+
+@lru_cache(maxsize=256)
+def _partial_schema(schema: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{f: (schema.model_fields[f].annotation, schema.model_fields[f]) for f in fields},
+    )
+
+
+def sparse_page(
+    schema: Type[BaseModel],
+    rows: List[Any],
+    fields: Tuple[str, ...],
+    next_cursor: Optional[str],
+) -> JSONResponse:
+    """A Page of `rows` serialized with only `fields` of `schema`."""
+    partial = _partial_schema(schema, fields)
+    page = Page[partial](
+        items=[partial.model_validate(row) for row in rows],
+        next_cursor=next_cursor
+    )
+    return JSONResponse(content=page.model_dump(mode="json"))
@@ -1,12 +1,15 @@
 """
 File handling utilities for document processing.
 """
+import hashlib
 import os
+import uuid
 import PyPDF2
 import docx
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import BinaryIO, Tuple, Optional
 from fastapi import UploadFile, HTTPException
+from starlette.concurrency import run_in_threadpool
 from config import get_settings
 
 settings = get_settings()
@@ -14,8 +17,26 @@ print("\n\n")
 
 
 def ensure_upload_dir():
-    """Ensure the upload directory exists."""
-    Path(settings.UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
+    """Ensure the upload directory (and its temp area) exists."""
+    Path(upload_tmp_dir()).mkdir(parents=True, exist_ok=True)
+
+
+def upload_tmp_dir() -> str:
+    """In-progress uploads live here, on the same filesystem as their final path."""
+    return os.path.join(settings.UPLOAD_DIR, ".tmp")
+
+
+def content_path(content_hash: str, file_ext: str) -> str:
+    """
+    Content-addressed location of a stored file.
+    
+    Files are sharded two levels deep by hash prefix
+    (`<UPLOAD_DIR>/ab/cd/abcd...<ext>`), so no directory grows past a few
+    hundred entries even with millions of uploads.
+    """
+    return os.path.join(
+        settings.UPLOAD_DIR, content_hash[:2], content_hash[2:4], f"{content_hash}{file_ext}"
+    )
 
 
 def validate_file(file: UploadFile, allowed_extensions: list[str] = None) -> None:
@@ -40,49 +61,125 @@ def validate_file(file: UploadFile, allowed_extensions: list[str] = None) -> Non
             detail=f"Invalid file type. Allowed types: {', '.join(allowed_extensions)}"
         )
     
-    # Check file size (if we can)
+    # Check file size (if we can); save_upload_file enforces it while streaming otherwise
     if hasattr(file, 'size') and file.size:
         if file.size > settings.MAX_UPLOAD_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
-            )
+            raise _file_too_large()
+
+
+def _file_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
+    )
+
+
+def _write_chunk(out: BinaryIO, hasher: "hashlib._Hash", chunk: bytes) -> None:
+    """Hash and write one chunk (runs in the threadpool; hashlib releases the GIL)."""
+    hasher.update(chunk)
+    out.write(chunk)
 
 
-async def save_upload_file(file: UploadFile, user_id: int) -> Tuple[str, int]:
+def _publish(out: BinaryIO, tmp_path: str, file_path: str) -> None:
+    """Durably move a finished temp file to its content-addressed path."""
+    out.flush()
+    os.fsync(out.fileno())
+    out.close()
+    try:
+        # Identical content already stored: refresh its mtime so the storage
+        # GC grace period covers this upload until its document is committed
+        os.utime(file_path)
+        os.remove(tmp_path)
+        return
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    os.replace(tmp_path, file_path)
+
+
+async def save_upload_file(file: UploadFile, user_id: int) -> Tuple[str, int, str]:
     """
-    Save an uploaded file to disk.
+    Stream an uploaded file to disk in UPLOAD_CHUNK_SIZE chunks.
+    
+    Writes happen in the threadpool so the event loop never blocks on disk,
+    the SHA-256 is computed as data arrives, and the upload is aborted as
+    soon as it exceeds MAX_UPLOAD_SIZE. Data goes to a temporary file that
+    is renamed into place only when complete.
+    
+    Stored files are keyed by content hash (see `content_path`), so
+    identical uploads share one file regardless of the client filename and
+    uploads that merely share a name never overwrite each other. The rename
+    is atomic: readers see either no file or the complete file.
     
     Args:
         file: Uploaded file
         user_id: ID of the user uploading
         
     Returns:
-        Tuple of (file_path, file_size)
+        Tuple of (file_path, file_size, sha256 hex digest)
+        
+    Raises:
+        HTTPException: If the file exceeds MAX_UPLOAD_SIZE
     """
     ensure_upload_dir()
     
-    # Generate unique filename
-    file_ext = Path(file.filename).suffix
-    safe_filename = f"user_{user_id}_{file.filename}"
-    file_path = os.path.join(settings.UPLOAD_DIR, safe_filename)
+    # Final name depends on the hash, so stream to a uniquely named temp file
+    file_ext = Path(file.filename).suffix.lower()
+    tmp_path = os.path.join(upload_tmp_dir(), f"user_{user_id}_{uuid.uuid4().hex}.part")
     
-    # Save file
-    content = await file.read()
-    with open(file_path, "wb") as f:
-        f.write(content)
+    hasher = hashlib.sha256()
+    file_size = 0
+    out = await run_in_threadpool(open, tmp_path, "wb")
+    try:
+        while True:
+            chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            file_size += len(chunk)
+            if file_size > settings.MAX_UPLOAD_SIZE:
+                raise _file_too_large()
+            await run_in_threadpool(_write_chunk, out, hasher, chunk)
+        
+        content_hash = hasher.hexdigest()
+        file_path = content_path(content_hash, file_ext)
+        await run_in_threadpool(_publish, out, tmp_path, file_path)
+    except BaseException:
+        out.close()
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
     
-    file_size = len(content)
+    return file_path, file_size, content_hash
+
+
+def count_pdf_pages(file_path: str) -> int:
+    """
+    Count the pages of a PDF file without extracting any text.
+    
+    Args:
+        file_path: Path to PDF file
+        
+    Returns:
+        Number of pages
+    """
+    try:
+        with open(file_path, 'rb') as file:
+            return len(PyPDF2.PdfReader(file).pages)
     
-    return file_path, file_size
+    except Exception as e:
+        raise Exception(f"Failed to read PDF: {str(e)}")
 
 
-def extract_text_from_pdf(file_path: str) -> str:
+def extract_text_from_pdf(file_path: str, start: int = 0, stop: Optional[int] = None) -> str:
     """
-    Extract text from a PDF file.
+    Extract text from a PDF file, optionally from a page range only.
     
     Args:
         file_path: Path to PDF file
+        start: First page (0-based, inclusive)
+        stop: Last page (exclusive); None for the end of the document
         
     Returns:
         Extracted text
@@ -91,8 +188,11 @@ def extract_text_from_pdf(file_path: str) -> str:
         text_parts = []
         with open(file_path, 'rb') as file:
             pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                text = page.extract_text()
+            pages = pdf_reader.pages
+            if stop is None:
+                stop = len(pages)
+            for page_number in range(start, stop):
+                text = pages[page_number].extract_text()
                 if text:
                     text_parts.append(text)
         
@@ -124,27 +224,3 @@ def extract_text_from_docx(file_path: str) -> str:
     
     except Exception as e:
         raise Exception(f"Failed to extract text from DOCX: {str(e)}")
-
-
-def extract_text_from_file(file_path: str) -> Tuple[str, str]:
-    """
-    Extract text from a file (PDF or DOCX).
-    
-    Args:
-        file_path: Path to file
-        
-    Returns:
-        Tuple of (extracted_text, method_used)
-    """
-    file_ext = Path(file_path).suffix.lower()
-    
-    if file_ext == ".pdf":
-        text = extract_text_from_pdf(file_path)
-        method = "pypdf2"
-    elif file_ext in [".docx", ".doc"]:
-        text = extract_text_from_docx(file_path)
-        method = "python-docx"
-    else:
-        raise ValueError(f"Unsupported file type: {file_ext}")
-    
-    return text, method
@@ -0,0 +1,128 @@
+"""
+OCR of scanned PDF pages with a local Tesseract binary.
+
+Runs inside extraction pool workers, one page per job. Each page is
+rendered to a grayscale bitmap with pypdfium2 and piped to `tesseract` as
+a PGM image, so neither Pillow nor pytesseract is needed. Tesseract runs
+as a child of the worker, so it inherits the worker's address-space
+rlimit, and it is limited to one thread because page-level parallelism
+comes from the pool.
+
+Results are cached on disk by the SHA-256 of the rendered page, so the
+same scan is never OCR'd twice, even inside a different file. A cache hit
+refreshes the entry's mtime; the storage GC prunes entries by that age and
+by total size (OCR_CACHE_MAX_AGE, OCR_CACHE_MAX_BYTES).
+"""
+import hashlib
+import logging
+import os
+import subprocess
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+try:
+    import pypdfium2
+except ImportError:  # OCR needs pypdfium2 to render pages
+    pypdfium2 = None
+
+OCR_METHOD = "tesseract"
+
+
+class OCRUnavailable(Exception):
+    """Tesseract or the PDF renderer is not installed."""
+
+
+def _render_page_pgm(file_path: str, page_number: int) -> bytes:
+    """Render one PDF page to a binary PGM at OCR_DPI."""
+    pdf = pypdfium2.PdfDocument(file_path)
+    try:
+        page = pdf[page_number]
+        bitmap = page.render(scale=settings.OCR_DPI / 72, grayscale=True)
+        width, height, stride = bitmap.width, bitmap.height, bitmap.stride
+        buffer = bytes(bitmap.buffer)
+        bitmap.close()
+        page.close()
+    finally:
+        pdf.close()
+
+    if stride == width:
+        pixels = buffer
+    else:
+        pixels = b"".join(buffer[row * stride:row * stride + width] for row in range(height))
+    return b"P5\n%d %d\n255\n" % (width, height) + pixels
+
+
+def _cache_path(page_hash: str) -> Path:
+    return Path(settings.OCR_CACHE_DIR) / page_hash[:2] / f"{page_hash}.txt"
+
+
+def _read_cache(page_hash: str) -> Optional[str]:
+    path = _cache_path(page_hash)
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+    try:
+        os.utime(path)  # recently used entries survive cache pruning
+    except OSError:
+        pass
+    return text
+
+
+def _write_cache(page_hash: str, text: str) -> None:
+    path = _cache_path(page_hash)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.part")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not cache OCR result {page_hash}: {e}")
+
+
+def ocr_pdf_page(file_path: str, page_number: int) -> str:
+    """
+    OCR one page of a PDF.
+
+    Args:
+        file_path: Path to PDF file
+        page_number: 0-based page index
+
+    Returns:
+        Recognized text
+
+    Raises:
+        OCRUnavailable: If pypdfium2 or the tesseract binary is missing
+    """
+    if pypdfium2 is None:
+        raise OCRUnavailable("pypdfium2 is required to render pages for OCR")
+
+    image = _render_page_pgm(file_path, page_number)
+    page_hash = hashlib.sha256(image).hexdigest()
+    cached = _read_cache(page_hash)
+    if cached is not None:
+        return cached
+
+    try:
+        result = subprocess.run(
+            [settings.TESSERACT_CMD, "stdin", "stdout", "-l", settings.OCR_LANGUAGES],
+            input=image,
+            capture_output=True,
+            timeout=settings.OCR_PAGE_TIMEOUT,
+            env={**os.environ, "OMP_THREAD_LIMIT": "1"},
+            check=True,
+        )
+    except FileNotFoundError as e:
+        raise OCRUnavailable(f"Tesseract not found at {settings.TESSERACT_CMD!r}") from e
+    except subprocess.CalledProcessError as e:
+        raise Exception(f"Tesseract failed on page {page_number + 1}: {e.stderr.decode(errors='replace')}")
+
+    text = result.stdout.decode("utf-8", errors="replace").strip()
+    _write_cache(page_hash, text)
+    return text
@@ -0,0 +1,90 @@
+"""
+Keyset (cursor) pagination for newest-first lists.
+
+Pages are ordered by (timestamp DESC, id DESC) and continue strictly after
+the last row of the previous page, so every page costs the same index
+range scan no matter how deep it is, and rows inserted meanwhile do not
+shift later pages. The cursor is an opaque URL-safe token encoding that
+last (timestamp, id) pair.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import Select
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """Opaque cursor for the position right after (sort_value, row_id)."""
+    raw = json.dumps([sort_value.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Inverse of encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def page_query(
+    query: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    after: Optional[Tuple[datetime, int]],
+    limit: int,
+) -> Select:
+    """`query` restricted to the rows after the (sort_value, id) position, newest first."""
+    if after is not None:
+        query = query.where(tuple_(sort_column, id_column) < tuple_(*after))
+    return query.order_by(sort_column.desc(), id_column.desc()).limit(limit)
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    cursor: Optional[str],
+    limit: int,
+) -> Tuple[List, Optional[str]]:
+    """
+    Fetch one page of `query`, newest first.
+
+    Returns:
+        Tuple of (rows, next_cursor); next_cursor is None on the last page
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+
+    # One extra row tells whether another page exists
+    rows = (await db.scalars(page_query(query, sort_column, id_column, after, limit + 1))).all()
+
+    if len(rows) <= limit:
+        return list(rows), None
+    rows = rows[:limit]
+    last = rows[-1]
+    return list(rows), encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
@@ -0,0 +1,115 @@
+"""
+Per-request SQL instrumentation: statement count, DB time, the slowest
+statement, and a sampled slow-query log.
+
+A counter is bound to the current context with `count_queries()`; every
+statement an instrumented engine executes inside that context (including
+tasks spawned from it) is tallied on it. Slow statements are logged
+whether or not a counter is active, with bound parameters redacted.
+"""
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config import get_settings
+
+settings = get_settings()
+slow_query_logger = logging.getLogger("sql.slow")
+
+
+class TooManyQueries(RuntimeError):
+    """A request issued more SQL statements than QUERY_COUNT_THRESHOLD allows."""
+
+
+class QueryCounter:
+    """Statements executed within one `count_queries()` block."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_time = 0.0  # seconds
+        self.slowest: Optional[Tuple[str, float]] = None
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.statements[statement] += 1
+        if self.slowest is None or duration > self.slowest[1]:
+            self.slowest = (statement, duration)
+
+    def most_repeated(self) -> Optional[Tuple[str, int]]:
+        """The statement executed most often and how many times, if any."""
+        common = self.statements.most_common(1)
+        return common[0] if common else None
+
+
+_current: ContextVar[Optional[QueryCounter]] = ContextVar("query_counter", default=None)
+
+
+def _redacted(parameters) -> str:
+    """Parameter shapes only (types, never values), e.g. "(int, str)"."""
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"{len(parameters)} x {_redacted(parameters[0])}"  # executemany
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_start"].pop()
+
+    counter = _current.get()
+    if counter is not None:
+        counter.record(statement, duration)
+
+    if (
+        settings.SLOW_QUERY_MS > 0
+        and duration * 1000 >= settings.SLOW_QUERY_MS
+        and random.random() < settings.SLOW_QUERY_SAMPLE_RATE
+    ):
+        slow_query_logger.warning(
+            "Slow query (%.1fms): %s | params: %s",
+            duration * 1000, " ".join(statement.split()), _redacted(parameters),
+        )
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute is skipped for failed statements
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def install(engine: Engine) -> None:
+    """Instrument `engine` (for an async engine, its sync_engine)."""
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+        ("handle_error", _handle_error),
+    ):
+        if not event.contains(engine, name, listener):
+            event.listen(engine, name, listener)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """Count the statements executed by instrumented engines inside this block."""
+    counter = QueryCounter()
+    token = _current.set(counter)
+    try:
+        yield counter
+    finally:
+        _current.reset(token)
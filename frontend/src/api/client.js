@@ -44,6 +44,30 @@ export const authAPI = {
   logout: () => api.post('/auth/logout'), // Important: call backend to clear cookie
 };
 
+const redirectIfUnauthorized = (response) => {
+  if (response.status === 401 && window.location.pathname !== '/login') {
+    window.location.href = '/login';
+  }
+};
+
+// Calls onEvent for every line of an NDJSON streaming response
+const readNdjson = async (response, onEvent) => {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split('\n');
+    buffer = lines.pop();
+    for (const line of lines) {
+      if (line.trim()) onEvent(JSON.parse(line));
+    }
+  }
+  if (buffer.trim()) onEvent(JSON.parse(buffer));
+};
+
 // Documents endpoints
 export const documentsAPI = {
   upload: (file, docType = 'resume') => {
@@ -53,9 +77,31 @@ export const documentsAPI = {
     
     return api.post('/documents/upload', formData);
   },
-  list: () => api.get('/documents/'),
+  // Streams per-file `stored` / `extracted` / `profile_updated` / `error`
+  // events and a final `done` event to onEvent.
+  uploadBatch: async (files, docTypes = ['resume'], onEvent, signal) => {
+    const formData = new FormData();
+    for (const file of files) formData.append('files', file);
+    for (const docType of docTypes) formData.append('doc_types', docType);
+
+    const response = await fetch(`${API_BASE_URL}/documents/upload-batch`, {
+      method: 'POST',
+      credentials: 'include',
+      body: formData,
+      signal,
+    });
+    if (!response.ok) {
+      redirectIfUnauthorized(response);
+      throw new Error(`Batch upload failed (${response.status})`);
+    }
+    await readNdjson(response, onEvent);
+  },
+  // Paginated: resolves to { items, next_cursor }; pass next_cursor back as `cursor`
+  list: ({ cursor, limit } = {}) => api.get('/documents/', { params: { cursor, limit } }),
   get: (id) => api.get(`/documents/${id}`),
   getText: (id) => api.get(`/documents/${id}/text`),
+  // Direct URL (cookie-authenticated) for links / embedded PDF viewers
+  fileUrl: (id) => `${API_BASE_URL}/documents/${id}/file`,
   delete: (id) => api.delete(`/documents/${id}`),
 };
 
@@ -63,7 +109,7 @@ export const documentsAPI = {
 export const profilesAPI = {
   create: (data) => api.post('/profiles/', data),
   createFromDocument: (documentId) => api.post(`/profiles/from-document/${documentId}`),
-  list: () => api.get('/profiles/'),
+  list: ({ cursor, limit, fields } = {}) => api.get('/profiles/', { params: { cursor, limit, fields } }),
   getLatest: () => api.get('/profiles/latest'),
   get: (id) => api.get(`/profiles/${id}`),
   update: (id, data) => api.patch(`/profiles/${id}`, data),
@@ -78,7 +124,9 @@ export const opportunitiesAPI = {
     const params = profileId ? `?profile_id=${profileId}` : '';
     return api.post(`/opportunities/${id}/analyze${params}`);
   },
-  list: (status = null, type = null) => {
+  // Paginated: resolves to { items, next_cursor }; pass next_cursor back as `cursor`.
+  // `fields` (e.g. 'id,title,status') returns only those properties per item.
+  list: (status = null, type = null, { cursor, limit, fields } = {}) => {
     const params = new URLSearchParams();
     if (status) {
       params.append('status_filter', status);
@@ -86,6 +134,15 @@ export const opportunitiesAPI = {
     if (type) {
       params.append('type_filter', type);
     }
+    if (cursor) {
+      params.append('cursor', cursor);
+    }
+    if (limit) {
+      params.append('limit', limit);
+    }
+    if (fields) {
+      params.append('fields', fields);
+    }
     const queryString = params.toString();
     return api.get(`/opportunities/${queryString ? `?${queryString}` : ''}`);
   },
@@ -97,7 +154,8 @@ export const opportunitiesAPI = {
 // Materials endpoints
 export const materialsAPI = {
   generate: (data) => api.post('/materials/generate', data),
-  getForOpportunity: (opportunityId) => api.get(`/materials/opportunity/${opportunityId}`),
+  getForOpportunity: (opportunityId, { cursor, limit } = {}) =>
+    api.get(`/materials/opportunity/${opportunityId}`, { params: { cursor, limit } }),
   get: (id) => api.get(`/materials/${id}`),
   delete: (id) => api.delete(`/materials/${id}`),
 };
@@ -4,6 +4,22 @@ import { opportunitiesAPI, profilesAPI } from '../api/client';
 import { toast } from 'react-toastify';
 import { FiBriefcase, FiUpload, FiSearch, FiTrendingUp } from 'react-icons/fi';
 
+// Only what the recent-opportunities cards and the status counts need
+const DASHBOARD_FIELDS = 'id,title,organization,fit_score,status';
+const PAGE_SIZE = 100;
+
+// Every opportunity, one page at a time (the list is cursor-paginated)
+const fetchAllOpportunities = async () => {
+  const all = [];
+  let cursor = null;
+  do {
+    const res = await opportunitiesAPI.list(null, null, { cursor, limit: PAGE_SIZE, fields: DASHBOARD_FIELDS });
+    all.push(...res.data.items);
+    cursor = res.data.next_cursor;
+  } while (cursor);
+  return all;
+};
+
 const Dashboard = () => {
   const [opportunities, setOpportunities] = useState([]);
   const [profile, setProfile] = useState(null);
@@ -16,20 +32,21 @@ const Dashboard = () => {
 
   const fetchData = async () => {
     try {
-      const [oppsRes, profileRes] = await Promise.all([
-        opportunitiesAPI.list(),
+      const [opps, profileRes] = await Promise.all([
+        fetchAllOpportunities(),
         profilesAPI.getLatest().catch(() => null),
       ]);
 
-      setOpportunities(oppsRes.data);
+      // Newest first, so the first five are the most recent
+      setOpportunities(opps.slice(0, 5));
       setProfile(profileRes?.data);
 
       // Calculate stats
-      const total = oppsRes.data.length;
-      const toApply = oppsRes.data.filter(o => o.status === 'TO_APPLY').length;
-      const applied = oppsRes.data.filter(o => o.status === 'APPLIED').length;
-      const interview = oppsRes.data.filter(o => o.status === 'INTERVIEW').length;
-      
+      const total = opps.length;
+      const toApply = opps.filter(o => o.status === 'TO_APPLY').length;
+      const applied = opps.filter(o => o.status === 'APPLIED').length;
+      const interview = opps.filter(o => o.status === 'INTERVIEW').length;
+
       setStats({ total, toApply, applied, interview });
     } catch (error) {
       toast.error('Failed to load dashboard data');
@@ -132,7 +149,7 @@ const Dashboard = () => {
           <p className="text-gray-600 dark:text-gray-400">No opportunities yet. Start by analyzing some!</p>
         ) : (
           <div className="space-y-4">
-            {opportunities.slice(0, 5).map((opp) => (
+            {opportunities.map((opp) => (
               <Link
                 key={opp.id}
                 to={`/opportunities/${opp.id}`}
@@ -6,8 +6,13 @@ import { FiBriefcase } from 'react-icons/fi';
 import GrantSearch from '../components/GrantSearch';
 import JobSearch from '../components/JobSearch';
 
+// Only what the opportunity cards render
+const LIST_FIELDS = 'id,title,organization,description,deadline,fit_score,status';
+
 const Opportunities = () => {
   const [opportunities, setOpportunities] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [typeFilter, setTypeFilter] = useState('FULL_TIME');
   const [researchTab, setResearchTab] = useState('suggestions'); // 'suggestions' or 'search'
@@ -31,8 +36,9 @@ const Opportunities = () => {
   const fetchOpportunities = async () => {
     setLoading(true);
     try {
-      const response = await opportunitiesAPI.list(null, typeFilter);
-      setOpportunities(response.data);
+      const response = await opportunitiesAPI.list(null, typeFilter, { fields: LIST_FIELDS });
+      setOpportunities(response.data.items);
+      setNextCursor(response.data.next_cursor);
     } catch (error) {
       toast.error('Failed to load opportunities');
     } finally {
@@ -40,6 +46,19 @@ const Opportunities = () => {
     }
   };
 
+  const handleLoadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const response = await opportunitiesAPI.list(null, typeFilter, { cursor: nextCursor, fields: LIST_FIELDS });
+      setOpportunities((prev) => [...prev, ...response.data.items]);
+      setNextCursor(response.data.next_cursor);
+    } catch (error) {
+      toast.error('Failed to load more opportunities');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleFetchSuggestions = async () => {
     setGrantLoading(true);
     try {
@@ -360,6 +379,13 @@ const Opportunities = () => {
                 </div>
               </Link>
             ))}
+            {nextCursor && (
+              <div className="text-center">
+                <button onClick={handleLoadMore} disabled={loadingMore} className="btn btn-secondary">
+                  {loadingMore ? 'Loading...' : 'Load more'}
+                </button>
+              </div>
+            )}
           </div>
         )}
       </>
@@ -9,6 +9,7 @@ const OpportunityDetail = () => {
   const navigate = useNavigate();
   const [opportunity, setOpportunity] = useState(null);
   const [materials, setMaterials] = useState([]);
+  const [materialsCursor, setMaterialsCursor] = useState(null);
   const [loading, setLoading] = useState(true);
   const [updating, setUpdating] = useState(false);
 
@@ -23,7 +24,8 @@ const OpportunityDetail = () => {
         materialsAPI.getForOpportunity(id),
       ]);
       setOpportunity(oppRes.data);
-      setMaterials(matsRes.data);
+      setMaterials(matsRes.data.items);
+      setMaterialsCursor(matsRes.data.next_cursor);
     } catch (error) {
       toast.error('Failed to load opportunity');
       navigate('/opportunities');
@@ -32,6 +34,16 @@ const OpportunityDetail = () => {
     }
   };
 
+  const handleLoadMoreMaterials = async () => {
+    try {
+      const response = await materialsAPI.getForOpportunity(id, { cursor: materialsCursor });
+      setMaterials((prev) => [...prev, ...response.data.items]);
+      setMaterialsCursor(response.data.next_cursor);
+    } catch (error) {
+      toast.error('Failed to load more materials');
+    }
+  };
+
   const handleStatusUpdate = async (newStatus) => {
     setUpdating(true);
     try {
@@ -187,6 +199,13 @@ const OpportunityDetail = () => {
               </div>
             ))}
           </div>
+          {materialsCursor && (
+            <div className="text-center mt-4">
+              <button onClick={handleLoadMoreMaterials} className="btn btn-secondary">
+                Load more
+              </button>
+            </div>
+          )}
         </div>
       )}
     </div>